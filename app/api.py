@@ -0,0 +1,205 @@
+import logging
+import os
+import time
+import pandas as pd
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+from pydantic import BaseModel
+from config.dependences import carregar_config, carregar_schema, aplicar_schema
+from services.registros import RegistroStore
+from services.registros_sqlite import RegistroSQLite, TIPOS_SQL
+from services.metricas import MetricasHTTP
+
+# API de dados de dengue, separada do painel: importar este módulo carrega só o FastAPI, o pydantic
+# e a camada de dados (uso, a partir da raiz do projeto: uvicorn api:app --app-dir app --workers 4)
+app = FastAPI()
+
+# Logs estruturados (registros em JSON de uma linha)
+cfg_metricas = carregar_config()['metricas']
+logging.basicConfig(level=cfg_metricas['nivel_log'], format='%(asctime)s %(name)s %(levelname)s %(message)s')
+
+# Métricas das requisições, expostas em /metrics no formato do Prometheus
+metricas_http = MetricasHTTP(cfg_metricas['limites_latencia_s'], cfg_metricas['limites_tamanho_bytes'])
+
+@app.middleware('http')
+async def medir_requisicoes(request: Request, call_next):
+    inicio = time.perf_counter()
+    response = await call_next(request)
+    # Rota declarada (/items/{municipio:path}), e não o caminho pedido, para não criar uma série por município
+    rota = request.scope.get('route')
+    metricas_http.observar(
+        request.method,
+        rota.path if rota is not None else 'desconhecida',
+        response.status_code,
+        time.perf_counter() - inicio,
+        int(request.headers.get('content-length', 0)),
+        int(response.headers.get('content-length', 0)),
+    )
+    return response
+
+@app.get('/metrics')
+def metrics():
+    return PlainTextResponse(metricas_http.texto(), media_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+# Dataset inicial
+df = pd.DataFrame({
+    'municipio': ['Municipio1', 'Municipio2'],
+    'casos_est': [110, 160],
+    'casos_est_min': [100, 150],
+    'casos_est_max': [120, 170],
+    'casos': [100, 150],
+    'proba_disse>1': [0.2, 0.5],
+    'incidência_100khab': [50, 75],
+    'disseminação': [0.9, 1.0],
+    'população': [10000, 15000],
+    'tempmin': [20.0, 22.0],
+    'umidmax': [80, 85],
+    'umidmed': [70, 75],
+    'umidmin': [60, 65],
+    'tempmed': [25.0, 26.0],
+    'tempmax': [30.0, 32.0],
+    'estado': ['Estado1', 'Estado2'],
+    'longitude': [-51.9253, -49.9253],
+    'latitude': [-14.2350, -12.2350],
+    'data_week': ['2024-01-01', '2024-02-01']
+})
+
+
+# Modelo Pydantic para validação de entrada
+# Modelo para incluir todas as colunas
+class Item(BaseModel):
+    municipio: str
+    casos_est: int
+    casos_est_min: int
+    casos_est_max: int
+    casos: int
+    proba_disse: float
+    incidência_100khab: float
+    disseminação: float
+    população: int
+    tempmin: float
+    umidmax: int
+    umidmed: int
+    umidmin: int
+    tempmed: float
+    tempmax: float
+    estado: str
+    longitude: float
+    latitude: float
+    data_week: str
+
+# Modelo para operações em lote por município
+class LoteMunicipios(BaseModel):
+    municipios: list[str]
+
+# Modelos para a previsão de casos (vários pares município/semana por requisição)
+class ParPrevisao(BaseModel):
+    municipio: str
+    data_week: str
+
+class PedidoPrevisao(BaseModel):
+    pares: list[ParPrevisao]
+
+
+# Armazenamento dos registros da API (colunas iguais às do modelo Item)
+# - "sqlite": arquivo em disco compartilhado por todos os workers, que sobrevive a reinícios;
+# - "memoria": índices em memória, por processo, nos tipos compactos do esquema
+#   (data_week continua como texto, que é como o modelo Item a recebe).
+cfg_registros = carregar_config()['registros']
+registros_iniciais = df.rename(columns={'proba_disse>1': 'proba_disse'})[list(Item.model_fields)]
+if cfg_registros['backend'] == 'sqlite':
+    registros = RegistroSQLite(
+        cfg_registros['caminho'],
+        {nome: TIPOS_SQL[campo.annotation] for nome, campo in Item.model_fields.items()},
+        semente=registros_iniciais,
+        tamanho_pool=cfg_registros['tamanho_pool'],
+    )
+else:
+    registros = RegistroStore(aplicar_schema(
+        registros_iniciais,
+        {coluna: tipo for coluna, tipo in carregar_schema().items() if coluna != 'data_week'}
+    ))
+
+# Modelo de previsão carregado uma única vez, na inicialização do processo
+# (gerado com: python -m model.artefatos <arquivo.csv> <destino.joblib>)
+# Um artefato cujas features não correspondem aos campos do Item é recusado já aqui.
+cfg_previsao = carregar_config()['previsao']
+previsor = None
+erro_previsor = "Modelo de previsão não disponível"
+if os.path.exists(cfg_previsao['artefato']):
+    # O scikit-learn só é importado quando há um modelo para servir
+    from model.previsao import Previsor
+    try:
+        previsor = Previsor.de_arquivo(cfg_previsao['artefato'], cfg_previsao['tamanho_cache'], colunas=list(Item.model_fields))
+    except ValueError as e:
+        erro_previsor = f"Modelo de previsão inválido: {e}"
+        logging.getLogger(__name__).error(erro_previsor)
+
+# Rotas em lote (declaradas antes de /items/{municipio} para que "batch" não seja lido como município)
+# Read em lote: primeiro registro de cada município encontrado
+@app.get('/items/batch')
+def read_items(municipios: list[str] = Query(...)):
+    resultado = {}
+    for municipio in municipios:
+        result = registros.buscar(municipio)
+        if result:
+            resultado[municipio] = result[0]
+    return resultado
+
+# Upsert em lote
+@app.post('/items/batch')
+def upsert_items(items: list[Item]):
+    return {"gravados": registros.inserir_lote([item.model_dump() for item in items])}
+
+# Delete em lote
+@app.delete('/items/batch')
+def delete_items(lote: LoteMunicipios):
+    return {"removidos": registros.remover_municipios(lote.municipios)}
+
+# Read (leitura de um município específico)
+# (o município ocupa o resto do caminho, para aceitar nomes com '/', que chegam como %2F e são decodificados)
+@app.get('/items/{municipio:path}')
+def read_item(municipio: str):
+    result = registros.buscar(municipio)
+    if result:
+        return result[0]
+    return {"error": "Item não encontrado"}
+
+# Create (criação de novos registros; a mesma semana de um município é atualizada no lugar)
+@app.post('/items')
+def create_item(item: Item):
+    return registros.inserir(item.model_dump())
+
+# Delete (remoção de registros)
+@app.delete('/items/{municipio:path}')
+def delete_item(municipio: str):
+    return {"removidos": registros.remover_municipio(municipio)}
+
+# Update (atualização de registros)
+@app.put('/items/{municipio:path}')
+def update_item(municipio: str, new_item: Item):
+    result = registros.atualizar_municipio(municipio, new_item.model_dump())
+    if result is not None:
+        return result
+    return {"error": "Item não encontrado"}
+
+# Previsão de casos: as features de cada par vêm dos registros da API e todos os pares
+# que não estão no cache são previstos em uma única chamada do modelo
+@app.post('/forecast')
+def forecast(pedido: PedidoPrevisao):
+    if previsor is None:
+        return JSONResponse(status_code=500, content={"error": erro_previsor})
+    pares = [(par.municipio, par.data_week) for par in pedido.pares]
+    try:
+        previsoes = previsor.prever(pares, registros.buscar_chave)
+    except (KeyError, TypeError, ValueError) as e:
+        logging.getLogger(__name__).exception("Falha na previsão")
+        return JSONResponse(status_code=500, content={"error": f"Falha na previsão: {e}"})
+    return {
+        "versao": previsor.versao,
+        "previsoes": [
+            {"municipio": municipio, "data_week": data_week, "casos_previstos": previsao}
+            for (municipio, data_week), previsao in zip(pares, previsoes)
+        ],
+    }
@@ -0,0 +1,214 @@
+import io
+import os
+import platform
+import statistics
+import tempfile
+import time
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from config.dependences import carregar_config, carregar_schema
+from services.armazenamento import converter_para_parquet, ler_dataset
+from services.risco import aplicar_risco
+from services.agregados import construir_cubo, fatiar_cubo
+from services.ingestao import ler_resumo, ler_em_blocos
+from services.exportacao import exportar
+from services.registros import RegistroStore
+from services.registros_sqlite import RegistroSQLite
+
+# Quantidade de municípios por estado (IBGE), usada para distribuir os municípios sintéticos
+MUNICIPIOS_POR_ESTADO = {
+    'MG': 853, 'SP': 645, 'RS': 497, 'BA': 417, 'PR': 399, 'SC': 295, 'GO': 246, 'PI': 224, 'PB': 223,
+    'MA': 217, 'PE': 185, 'CE': 184, 'RN': 167, 'PA': 144, 'MT': 141, 'TO': 139, 'AL': 102, 'RJ': 92,
+    'MS': 79, 'ES': 78, 'SE': 75, 'AM': 62, 'RO': 52, 'AC': 22, 'AP': 16, 'RR': 15, 'DF': 1,
+}
+
+# Centro aproximado (longitude, latitude) de cada estado
+CENTROS_ESTADOS = {
+    'MG': (-44.6, -18.5), 'SP': (-48.5, -22.3), 'RS': (-53.2, -29.7), 'BA': (-41.7, -12.6), 'PR': (-51.6, -24.6),
+    'SC': (-50.4, -27.2), 'GO': (-49.6, -15.9), 'PI': (-42.7, -7.7), 'PB': (-36.8, -7.2), 'MA': (-45.3, -5.4),
+    'PE': (-37.9, -8.4), 'CE': (-39.6, -5.2), 'RN': (-36.5, -5.8), 'PA': (-52.3, -3.8), 'MT': (-55.9, -12.6),
+    'TO': (-48.3, -10.2), 'AL': (-36.6, -9.6), 'RJ': (-42.7, -22.3), 'MS': (-54.6, -20.5), 'ES': (-40.6, -19.6),
+    'SE': (-37.4, -10.6), 'AM': (-64.7, -4.2), 'RO': (-62.8, -10.9), 'AC': (-70.5, -9.0), 'AP': (-51.8, 1.4),
+    'RR': (-61.4, 2.1), 'DF': (-47.8, -15.8),
+}
+
+# Colunas do modelo Item da API (nesta ordem)
+COLUNAS_ITEM = ['municipio', 'casos_est', 'casos_est_min', 'casos_est_max', 'casos', 'proba_disse',
+                'incidência_100khab', 'disseminação', 'população', 'tempmin', 'umidmax', 'umidmed', 'umidmin',
+                'tempmed', 'tempmax', 'estado', 'longitude', 'latitude', 'data_week']
+
+
+# Função para gerar um dataset sintético com as colunas do modelo Item
+# Os municípios são sorteados na proporção real de municípios por estado; cada um tem uma série
+# semanal a partir de 2010 com sazonalidade de casos e clima. Com muitas linhas, as séries
+# passam de 2024 (o crescimento esperado do dataset).
+def gerar_dados(n_linhas, semente=42):
+    rng = np.random.default_rng(semente)
+    estados_todos = np.repeat(list(MUNICIPIOS_POR_ESTADO), list(MUNICIPIOS_POR_ESTADO.values()))
+    n_municipios = int(min(len(estados_todos), max(1, -(-n_linhas // 52))))
+    n_semanas = -(-n_linhas // n_municipios)
+
+    escolhidos = np.sort(rng.choice(len(estados_todos), size=n_municipios, replace=False))
+    estados = estados_todos[escolhidos]
+    nomes = np.array([f'{estado}-{i:04d}' for estado, i in zip(estados, escolhidos)])
+    centros = np.array([CENTROS_ESTADOS[estado] for estado in estados])
+    longitudes = centros[:, 0] + rng.normal(0, 1.5, n_municipios)
+    latitudes = centros[:, 1] + rng.normal(0, 1.5, n_municipios)
+    populacoes = rng.lognormal(9.5, 1.2, n_municipios).astype('int64') + 800
+
+    # Linhas na ordem (semana, município), cortadas em exatamente n_linhas
+    municipio = np.tile(np.arange(n_municipios), n_semanas)[:n_linhas]
+    semana = np.repeat(np.arange(n_semanas), n_municipios)[:n_linhas]
+    sazonal = np.sin(2 * np.pi * (semana % 52) / 52)
+    populacao = populacoes[municipio]
+
+    incidencia = np.maximum(rng.gamma(2.0, 10.0, n_linhas) * (1.5 + sazonal), 0)
+    casos = rng.poisson(incidencia * populacao / 100_000)
+    casos_est = casos * rng.uniform(1.0, 1.4, n_linhas)
+    tempmed = 24 + 4 * sazonal + rng.normal(0, 1.5, n_linhas)
+    umidmed = np.clip(70 + 10 * sazonal + rng.normal(0, 5, n_linhas), 20, 100)
+
+    return pd.DataFrame({
+        'municipio': nomes[municipio],
+        'casos_est': casos_est.round(1),
+        'casos_est_min': np.floor(casos_est * 0.8).astype('int64'),
+        'casos_est_max': np.ceil(casos_est * 1.2).astype('int64'),
+        'casos': casos,
+        'proba_disse': rng.uniform(0, 1, n_linhas).round(3),
+        'incidência_100khab': (casos / populacao * 100_000).round(2),
+        'disseminação': rng.uniform(0, 3, n_linhas).round(2),
+        'população': populacao,
+        'tempmin': (tempmed - rng.uniform(3, 6, n_linhas)).round(1),
+        'umidmax': np.clip(umidmed + rng.uniform(5, 15, n_linhas), 0, 100).round(),
+        'umidmed': umidmed.round(),
+        'umidmin': np.clip(umidmed - rng.uniform(5, 15, n_linhas), 0, 100).round(),
+        'tempmed': tempmed.round(1),
+        'tempmax': (tempmed + rng.uniform(3, 6, n_linhas)).round(1),
+        'estado': estados[municipio],
+        'longitude': longitudes[municipio].round(4),
+        'latitude': latitudes[municipio].round(4),
+        'data_week': (pd.Timestamp('2010-01-03') + pd.to_timedelta(semana * 7, unit='D')).strftime('%Y-%m-%d'),
+    })
+
+
+# Função para medir o tempo de uma função (mediana e mínimo de algumas repetições)
+def medir(funcao, repeticoes=3):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return {'mediana_s': statistics.median(tempos), 'minimo_s': min(tempos), 'repeticoes': repeticoes}
+
+
+# Função para medir o caminho de dados do painel: leitura, risco, mínimos/máximos, filtros do upload e download
+def medir_dados(df, diretorio, repeticoes=3):
+    schema = carregar_schema()
+    caminho_csv = os.path.join(diretorio, 'dados.csv')
+    df.to_csv(caminho_csv, index=False)
+    cfg_csv = {'csv_dengue': caminho_csv, 'parquet_dengue': os.path.join(diretorio, 'sem_parquet')}
+    cfg_parquet = {'csv_dengue': caminho_csv, 'parquet_dengue': os.path.join(diretorio, 'parquet')}
+
+    # Estado com mais linhas, como a escolha mais pesada do seletor de estado
+    estado = df['estado'].value_counts().index[0]
+    resultados = {}
+    resultados['converter_para_parquet'] = medir(lambda: converter_para_parquet(caminho_csv, cfg_parquet['parquet_dengue'], schema), 1)
+    resultados['carregar_dataset_csv'] = medir(lambda: ler_dataset(cfg_csv, schema, estados=(estado,)), repeticoes)
+    resultados['carregar_dataset_parquet'] = medir(lambda: ler_dataset(cfg_parquet, schema, estados=(estado,)), repeticoes)
+
+    df_estado = ler_dataset(cfg_parquet, schema, estados=(estado,))
+    df_estado['data_week'] = pd.to_datetime(df_estado['data_week'])
+    resultados['aplicar_risco'] = medir(lambda: aplicar_risco(df_estado, carregar_config()['risco']), repeticoes)
+
+    df_estado = aplicar_risco(df_estado, carregar_config()['risco'])
+    data_maxima = df_estado['data_week'].max()
+    data_inicial = data_maxima - pd.DateOffset(years=1)
+    resultados['construir_cubo'] = medir(lambda: construir_cubo(df_estado), repeticoes)
+    cubo = construir_cubo(df_estado)
+    resultados['fatiar_cubo'] = medir(lambda: fatiar_cubo(cubo, estado, data_inicial, data_maxima), repeticoes)
+
+    # Aba de upload: resumo do arquivo, leitura em blocos do estado escolhido e filtro de municípios
+    with open(caminho_csv, 'rb') as f:
+        arquivo = io.BytesIO(f.read())
+    municipios = df.loc[df['estado'] == estado, 'municipio'].unique()[:50]
+
+    def filtros_upload():
+        ler_resumo(arquivo)
+        dados = ler_em_blocos(arquivo, (estado,), schema)
+        return dados[dados['municipio'].isin(municipios)]
+
+    resultados['filtros_upload'] = medir(filtros_upload, repeticoes)
+    dados_filtrados = ler_em_blocos(arquivo, (estado,), schema)
+    resultados['convert_df_csv_gzip'] = medir(lambda: exportar(dados_filtrados, 'CSV (gzip)'), repeticoes)
+    resultados['convert_df_parquet'] = medir(lambda: exportar(dados_filtrados, 'Parquet'), repeticoes)
+    return resultados
+
+
+# Função para medir cada rota CRUD da API (com o TestClient) sobre um armazenamento com os dados sintéticos
+# Os tempos são por requisição (mediana de `requisicoes` chamadas).
+def medir_api(modulo_api, df, diretorio, backend, requisicoes=50):
+    from fastapi.testclient import TestClient
+
+    registros = df[COLUNAS_ITEM].to_dict('records')
+    inicio = time.perf_counter()
+    if backend == 'sqlite':
+        store = RegistroSQLite(os.path.join(diretorio, 'registros.sqlite'),
+                               {c: 'TEXT' if df[c].dtype == object else 'REAL' if df[c].dtype.kind == 'f' else 'INTEGER' for c in COLUNAS_ITEM})
+        store.inserir_lote(registros)
+    else:
+        store = RegistroStore(df[COLUNAS_ITEM].copy())
+    resultados = {'carga_s': time.perf_counter() - inicio}
+    modulo_api.registros = store
+
+    cliente = TestClient(modulo_api.app)
+    municipios = df['municipio'].unique()
+    novo = dict(registros[0], data_week='2099-01-01')
+
+    def por_requisicao(chamada):
+        tempos = []
+        for i in range(requisicoes):
+            inicio = time.perf_counter()
+            chamada(i)
+            tempos.append(time.perf_counter() - inicio)
+        return {'mediana_s': statistics.median(tempos), 'p95_s': float(np.percentile(tempos, 95)), 'requisicoes': requisicoes}
+
+    resultados['GET /items/{municipio}'] = por_requisicao(lambda i: cliente.get(f'/items/{municipios[i % len(municipios)]}'))
+    resultados['POST /items'] = por_requisicao(lambda i: cliente.post('/items', json=dict(novo, municipio=f'novo-{i}')))
+    resultados['PUT /items/{municipio}'] = por_requisicao(lambda i: cliente.put(f'/items/novo-{i}', json=dict(novo, municipio=f'novo-{i}', casos=i)))
+    resultados['DELETE /items/{municipio}'] = por_requisicao(lambda i: cliente.delete(f'/items/novo-{i}'))
+    lote = list(municipios[:100])
+    resultados['GET /items/batch'] = por_requisicao(lambda i: cliente.get('/items/batch', params={'municipios': lote}))
+    resultados['POST /items/batch'] = por_requisicao(lambda i: cliente.post('/items/batch', json=[
+        dict(novo, municipio=f'lote-{i}', data_week=f'2099-{j:04d}') for j in range(100)]))
+    resultados['DELETE /items/batch'] = por_requisicao(lambda i: cliente.request('DELETE', '/items/batch', json={'municipios': [f'lote-{i}']}))
+    return resultados
+
+
+# Função para executar o benchmark completo para cada tamanho e devolver o relatório (serializável em JSON)
+# A API é medida com até `limite_api` linhas carregadas em cada armazenamento.
+def executar_benchmark(tamanhos, modulo_api=None, repeticoes=3, limite_api=1_000_000):
+    relatorio = {
+        'executado_em': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'cpus': os.cpu_count(),
+        'resultados': [],
+    }
+    for n_linhas in tamanhos:
+        with tempfile.TemporaryDirectory() as diretorio:
+            inicio = time.perf_counter()
+            df = gerar_dados(n_linhas)
+            resultado = {
+                'n_linhas': n_linhas,
+                'n_municipios': int(df['municipio'].nunique()),
+                'ultima_semana': df['data_week'].max(),
+                'gerar_dados_s': time.perf_counter() - inicio,
+                'dados': medir_dados(df, diretorio, repeticoes),
+            }
+            if modulo_api is not None:
+                df_api = df.iloc[:limite_api]
+                resultado['api'] = {backend: medir_api(modulo_api, df_api, diretorio, backend) for backend in ('memoria', 'sqlite')}
+            relatorio['resultados'].append(resultado)
+            print(f"{n_linhas} linhas medidas.")
+    return relatorio
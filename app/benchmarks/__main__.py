@@ -0,0 +1,28 @@
+import importlib
+import json
+import os
+import sys
+import tempfile
+from benchmarks import executar_benchmark
+
+# Uso (a partir da pasta app): python -m benchmarks [<arquivo_saida.json>] [<tamanhos separados por vírgula>]
+if __name__ == '__main__':
+    saida = sys.argv[1] if len(sys.argv) > 1 else os.path.join('..', 'data_sus', 'benchmarks', 'resultados.json')
+    tamanhos = [int(n) for n in sys.argv[2].split(',')] if len(sys.argv) > 2 else [1_000, 100_000, 1_000_000, 5_000_000]
+    saida = os.path.abspath(saida)
+
+    # O módulo da API é importado a partir de uma pasta temporária, para que os caminhos relativos
+    # da configuração (dados, banco SQLite) não apontem para os dados reais
+    diretorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as diretorio:
+        os.chdir(diretorio)
+        try:
+            modulo_api = importlib.import_module('api')
+            relatorio = executar_benchmark(tamanhos, modulo_api)
+        finally:
+            os.chdir(diretorio_original)
+
+    os.makedirs(os.path.dirname(saida), exist_ok=True)
+    with open(saida, 'w', encoding='utf-8') as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    print(f"Resultados salvos em {saida}.")
@@ -0,0 +1,55 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+
+# Caminho do arquivo de configuração do projeto
+CAMINHO_CFG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cfg.json')
+
+
+# Função para carregar as configurações (lidas uma única vez por processo)
+@lru_cache(maxsize=None)
+def carregar_config():
+    with open(CAMINHO_CFG, encoding='utf-8') as f:
+        return json.load(f)
+
+
+# Função para obter o esquema de tipos compactos das colunas (seção "schema" do cfg.json)
+def carregar_schema():
+    return carregar_config()['schema']
+
+
+# Função para converter as colunas presentes no DataFrame para os tipos do esquema
+# Colunas inteiras são arredondadas e limitadas à faixa do tipo (por exemplo, umidade em uint8);
+# se tiverem valores ausentes, usam o tipo inteiro anulável do pandas (UInt8, Int32).
+def aplicar_schema(df, schema):
+    for coluna, tipo in schema.items():
+        if coluna not in df.columns:
+            continue
+        if tipo == 'category':
+            if not isinstance(df[coluna].dtype, pd.CategoricalDtype):
+                df[coluna] = df[coluna].astype('category')
+        elif tipo.startswith('datetime'):
+            df[coluna] = pd.to_datetime(df[coluna], errors='coerce')
+        elif np.issubdtype(np.dtype(tipo), np.integer):
+            limites = np.iinfo(tipo)
+            valores = pd.to_numeric(df[coluna], errors='coerce').round().clip(limites.min, limites.max)
+            if valores.isna().any():
+                tipo = pd.api.types.pandas_dtype(tipo.capitalize() if tipo.startswith('int') else 'U' + tipo[1:].capitalize())
+            df[coluna] = valores.astype(tipo)
+        else:
+            df[coluna] = pd.to_numeric(df[coluna], errors='coerce').astype(tipo)
+    return df
+
+
+# Função para obter os tipos usados na leitura de CSV (antes de filtrar e aplicar o esquema):
+# texto para as categorias e float32 para os números, que aceitam valores ausentes
+def dtypes_leitura(schema):
+    tipos = {}
+    for coluna, tipo in schema.items():
+        if tipo == 'category':
+            tipos[coluna] = str
+        elif not tipo.startswith('datetime'):
+            tipos[coluna] = 'float32'
+    return tipos
@@ -0,0 +1,15 @@
+import os
+import sys
+from model import criar_modelos
+from model.avaliacao import montar_dobras, executar_avaliacao, resumir
+
+# Uso (a partir da pasta app): python -m model [<arquivo.csv>] [<n_dobras>]
+if __name__ == '__main__':
+    caminho_csv = sys.argv[1] if len(sys.argv) > 1 else os.path.join('..', 'data_sus', 'PySUS', 'infodengue', 'dengue_rio_de_janeiro_2010_2024.csv')
+    n_dobras = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    X, y, dobras = montar_dobras(caminho_csv, n_dobras)
+    resultados = executar_avaliacao(X, y, dobras, criar_modelos())
+    print(resultados.to_string(index=False))
+    print()
+    print(resumir(resultados).to_string())
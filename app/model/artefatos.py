@@ -0,0 +1,62 @@
+import os
+import sys
+from datetime import datetime
+import joblib
+from sklearn.base import clone
+from model import preparar_dados, criar_modelos
+from services.arquivos import gravar_atomico
+
+# Colunas dos arquivos do infodengue (features do treino) -> campos do modelo Item da API,
+# de onde a previsão lê os valores de cada par (município, semana)
+MAPEAMENTO_ITEM = {
+    'casos_est': 'casos_est',
+    'casos_est_min': 'casos_est_min',
+    'casos_est_max': 'casos_est_max',
+    'p_rt1': 'proba_disse',
+    'p_inc100k': 'incidência_100khab',
+    'Rt': 'disseminação',
+    'pop': 'população',
+    'tempmin': 'tempmin',
+    'umidmax': 'umidmax',
+    'umidmed': 'umidmed',
+    'umidmin': 'umidmin',
+    'tempmed': 'tempmed',
+    'tempmax': 'tempmax',
+}
+
+
+# Função para treinar um modelo com todos os dados e montar o artefato servido pela API
+# Só entram no modelo as features que existem nos registros da API (colunas do `mapeamento`).
+# O artefato guarda o modelo, a lista de features (na ordem usada no treino), o campo do Item
+# de cada feature e a versão.
+def treinar_artefato(X, y, nome_modelo='Random Forest Regressor', mapeamento=MAPEAMENTO_ITEM):
+    features = [coluna for coluna in X.columns if coluna in mapeamento]
+    if not features:
+        raise ValueError("Nenhuma feature dos dados tem campo correspondente nos registros da API.")
+    modelo = clone(criar_modelos()[nome_modelo]).fit(X[features], y)
+    return {
+        'nome': nome_modelo,
+        'versao': f"{nome_modelo}-{datetime.now():%Y%m%d%H%M%S}",
+        'features': features,
+        'mapeamento': {feature: mapeamento[feature] for feature in features},
+        'modelo': modelo,
+    }
+
+
+# Função para salvar o artefato (gravação atômica, para que a API nunca leia um arquivo pela metade)
+def salvar_artefato(artefato, caminho):
+    os.makedirs(os.path.dirname(caminho) or '.', exist_ok=True)
+    gravar_atomico(caminho, lambda caminho_temporario: joblib.dump(artefato, caminho_temporario))
+
+
+# Função para carregar o artefato salvo
+def carregar_artefato(caminho):
+    return joblib.load(caminho)
+
+
+# Uso (a partir da pasta app): python -m model.artefatos <arquivo.csv> <destino.joblib> [<nome do modelo>]
+if __name__ == '__main__':
+    X, y = preparar_dados(sys.argv[1])
+    artefato = treinar_artefato(X, y, *sys.argv[3:4])
+    salvar_artefato(artefato, sys.argv[2])
+    print(f"Artefato {artefato['versao']} salvo em {sys.argv[2]} ({len(artefato['features'])} features).")
@@ -0,0 +1,73 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+from joblib import Memory, Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import mean_absolute_error, mean_squared_error
+from sklearn.model_selection import TimeSeriesSplit
+from model import preparar_dados
+from services.arquivos import hash_arquivo
+
+# Cache em disco das dobras já montadas (por arquivo, conteúdo e parâmetros de divisão)
+memoria = Memory(os.path.join('..', 'data_sus', 'cache', 'modelos'), verbose=0)
+
+
+# O hash do conteúdo faz parte da chave do cache: se o ETL regravar o CSV ou chegarem semanas
+# novas, as dobras são montadas de novo em vez de virem do cache
+@memoria.cache
+def _montar_dobras(caminho_csv, hash_dados, n_dobras, tamanho_teste, intervalo):
+    X, y = preparar_dados(caminho_csv)
+    divisor = TimeSeriesSplit(n_splits=n_dobras, test_size=tamanho_teste, gap=intervalo)
+    dobras = list(divisor.split(X))
+    return X.to_numpy(dtype='float64'), y.to_numpy(dtype='float64'), dobras
+
+
+# Função para montar as dobras da validação por origem móvel (treino sempre anterior ao teste)
+# Devolve X e y como arrays e a lista de (índices de treino, índices de teste).
+def montar_dobras(caminho_csv, n_dobras=5, tamanho_teste=None, intervalo=0):
+    return _montar_dobras(caminho_csv, hash_arquivo(caminho_csv), n_dobras, tamanho_teste, intervalo)
+
+
+# Função para treinar e avaliar um modelo em uma dobra, medindo o tempo de treino e de previsão
+def avaliar_dobra(nome, modelo, X, y, treino, teste, dobra):
+    modelo = clone(modelo)
+    inicio = time.perf_counter()
+    modelo.fit(X[treino], y[treino])
+    tempo_treino = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    previsto = modelo.predict(X[teste])
+    tempo_previsao = time.perf_counter() - inicio
+
+    return {
+        'modelo': nome,
+        'dobra': dobra,
+        'n_treino': len(treino),
+        'n_teste': len(teste),
+        'mae': mean_absolute_error(y[teste], previsto),
+        'rmse': float(np.sqrt(mean_squared_error(y[teste], previsto))),
+        'tempo_treino_s': tempo_treino,
+        'tempo_previsao_s': tempo_previsao,
+    }
+
+
+# Função para avaliar todos os modelos em todas as dobras em paralelo (um processo por núcleo)
+# Os arrays grandes são compartilhados com os processos por memmap pelo joblib, sem uma cópia por tarefa.
+def executar_avaliacao(X, y, dobras, modelos, n_jobs=-1):
+    tarefas = (delayed(avaliar_dobra)(nome, modelo, X, y, treino, teste, dobra)
+               for nome, modelo in modelos.items()
+               for dobra, (treino, teste) in enumerate(dobras))
+    return pd.DataFrame(Parallel(n_jobs=n_jobs)(tarefas))
+
+
+# Função para resumir os resultados por modelo (média das dobras; tempo total de treino)
+def resumir(resultados):
+    resumo = resultados.groupby('modelo').agg(
+        mae=('mae', 'mean'),
+        rmse=('rmse', 'mean'),
+        tempo_treino_medio_s=('tempo_treino_s', 'mean'),
+        tempo_treino_total_s=('tempo_treino_s', 'sum'),
+        tempo_previsao_medio_s=('tempo_previsao_s', 'mean'),
+    )
+    return resumo.sort_values('rmse')
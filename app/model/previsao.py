@@ -0,0 +1,62 @@
+import threading
+from collections import OrderedDict
+import pandas as pd
+from model.artefatos import carregar_artefato
+
+
+# Serviço de previsão: mantém o modelo carregado e responde vários pares (município, semana) de uma vez
+# As previsões ficam em um cache LRU por (versão do modelo, município, semana).
+# Com `colunas` (campos dos registros), o artefato é validado ao carregar: toda feature precisa
+# de um campo correspondente, senão ValueError.
+class Previsor:
+
+    def __init__(self, artefato, tamanho_cache=100_000, colunas=None):
+        self.modelo = artefato['modelo']
+        self.features = artefato['features']
+        self.versao = artefato['versao']
+        # Campo do registro de cada feature (artefatos sem mapeamento usam o próprio nome da feature)
+        self.mapeamento = artefato.get('mapeamento') or {feature: feature for feature in self.features}
+        faltando = [feature for feature in self.features
+                    if feature not in self.mapeamento or (colunas is not None and self.mapeamento[feature] not in colunas)]
+        if faltando:
+            raise ValueError(f"Artefato {self.versao}: features sem campo correspondente nos registros: {', '.join(faltando)}")
+        self.tamanho_cache = tamanho_cache
+        self._cache = OrderedDict()
+        self._trava = threading.Lock()
+
+    @classmethod
+    def de_arquivo(cls, caminho, tamanho_cache=100_000, colunas=None):
+        return cls(carregar_artefato(caminho), tamanho_cache, colunas)
+
+    # Função para prever uma lista de pares (município, semana)
+    # `buscar_features(municipio, semana)` devolve o registro com as features ou None se não existir.
+    # Os pares fora do cache são previstos juntos, em uma única chamada de predict.
+    def prever(self, pares, buscar_features):
+        resultados = [None] * len(pares)
+        pendentes = []
+        with self._trava:
+            for i, (municipio, semana) in enumerate(pares):
+                chave = (self.versao, municipio, semana)
+                if chave in self._cache:
+                    self._cache.move_to_end(chave)
+                    resultados[i] = self._cache[chave]
+                else:
+                    pendentes.append(i)
+
+        linhas, posicoes = [], []
+        for i in pendentes:
+            registro = buscar_features(*pares[i])
+            if registro is not None:
+                linhas.append([registro[self.mapeamento[feature]] for feature in self.features])
+                posicoes.append(i)
+        if not linhas:
+            return resultados
+
+        previsoes = self.modelo.predict(pd.DataFrame(linhas, columns=self.features, dtype='float64'))
+        with self._trava:
+            for i, previsao in zip(posicoes, previsoes):
+                resultados[i] = float(previsao)
+                self._cache[(self.versao, *pares[i])] = resultados[i]
+            while len(self._cache) > self.tamanho_cache:
+                self._cache.popitem(last=False)
+        return resultados
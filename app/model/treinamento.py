@@ -0,0 +1,115 @@
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from model import preparar_dados
+from model.artefatos import treinar_artefato, salvar_artefato
+from services.arquivos import hash_arquivo, ler_json, gravar_json
+
+
+# Função para montar as features de todos os municípios pendentes em um único par de arquivos .npy
+# Os processos abrem esses arquivos com mmap (somente leitura), sem receber cópias dos dados.
+# Devolve as features e, por município, o intervalo [inicio, fim) das suas linhas.
+def montar_features(arquivos, diretorio_saida):
+    partes_X, partes_y, intervalos, erros = [], [], {}, {}
+    features = None
+    inicio = 0
+    for chave, caminho in arquivos.items():
+        try:
+            X, y = preparar_dados(caminho)
+        except Exception as e:
+            erros[chave] = str(e)
+            continue
+        if features is None:
+            features = list(X.columns)
+        if list(X.columns) != features:
+            erros[chave] = f"Colunas diferentes das demais: {list(X.columns)}"
+            continue
+        partes_X.append(X.to_numpy(dtype='float64'))
+        partes_y.append(y.to_numpy(dtype='float64'))
+        intervalos[chave] = (inicio, inicio + len(X))
+        inicio += len(X)
+
+    caminho_X = os.path.join(diretorio_saida, 'features_X.npy')
+    caminho_y = os.path.join(diretorio_saida, 'features_y.npy')
+    if partes_X:
+        np.save(caminho_X, np.concatenate(partes_X))
+        np.save(caminho_y, np.concatenate(partes_y))
+    return features, caminho_X, caminho_y, intervalos, erros
+
+
+# Função executada em cada processo: treina o modelo de um município e salva o artefato
+def treinar_municipio(chave, caminho_X, caminho_y, inicio, fim, features, nome_modelo, destino):
+    tempo_inicio = time.perf_counter()
+    X = pd.DataFrame(np.load(caminho_X, mmap_mode='r')[inicio:fim], columns=features)
+    y = pd.Series(np.load(caminho_y, mmap_mode='r')[inicio:fim])
+    artefato = treinar_artefato(X, y, nome_modelo)
+    salvar_artefato(artefato, destino)
+    return artefato['versao'], time.perf_counter() - tempo_inicio
+
+
+# Função para treinar um modelo por município, para todos os arquivos do diretório, em paralelo
+# Municípios cujo arquivo não mudou desde o último treino (mesmo hash no manifesto) são pulados,
+# e o manifesto é gravado a cada modelo concluído, então uma execução interrompida pode ser retomada.
+def treinar_diretorio(diretorio_csv, diretorio_saida, nome_modelo='Random Forest Regressor', max_workers=None):
+    diretorio_artefatos = os.path.join(diretorio_saida, 'artefatos')
+    os.makedirs(diretorio_artefatos, exist_ok=True)
+    caminho_manifesto = os.path.join(diretorio_saida, 'manifesto.json')
+    manifesto = ler_json(caminho_manifesto, {})
+
+    pendentes, hashes = {}, {}
+    for arquivo in sorted(f for f in os.listdir(diretorio_csv) if f.endswith('.csv')):
+        chave = os.path.splitext(arquivo)[0]
+        caminho = os.path.join(diretorio_csv, arquivo)
+        hashes[chave] = hash_arquivo(caminho)
+        registro = manifesto.get(chave)
+        if (registro and registro['hash_dados'] == hashes[chave] and registro['modelo'] == nome_modelo
+                and os.path.exists(os.path.join(diretorio_saida, registro['arquivo']))):
+            continue
+        pendentes[chave] = caminho
+    print(f"{len(hashes) - len(pendentes)} municípios já treinados; {len(pendentes)} pendentes.")
+
+    inicio = time.perf_counter()
+    features, caminho_X, caminho_y, intervalos, erros = montar_features(pendentes, diretorio_saida)
+    for chave, erro in erros.items():
+        print(f"Erro ao preparar os dados de {chave}: {erro}")
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futuros = {
+            executor.submit(treinar_municipio, chave, caminho_X, caminho_y, ini, fim, features, nome_modelo,
+                            os.path.join(diretorio_artefatos, f'{chave}.joblib')): chave
+            for chave, (ini, fim) in intervalos.items()
+        }
+        for futuro in as_completed(futuros):
+            chave = futuros[futuro]
+            try:
+                versao, tempo = futuro.result()
+            except Exception as e:
+                print(f"Erro ao treinar o modelo de {chave}: {e}")
+                continue
+            manifesto[chave] = {
+                'arquivo': os.path.join('artefatos', f'{chave}.joblib'),
+                'versao': versao,
+                'modelo': nome_modelo,
+                'hash_dados': hashes[chave],
+                'n_linhas': intervalos[chave][1] - intervalos[chave][0],
+                'treinado_em': datetime.now().isoformat(timespec='seconds'),
+            }
+            gravar_json(manifesto, caminho_manifesto)
+            print(f"Modelo de {chave} treinado ({tempo:.2f} s).")
+
+    for caminho in (caminho_X, caminho_y):
+        if os.path.exists(caminho):
+            os.remove(caminho)
+    print(f"{len(intervalos)} modelos treinados em {time.perf_counter() - inicio:.2f} s.")
+    return manifesto
+
+
+# Uso (a partir da pasta app): python -m model.treinamento [<diretorio_csv>] [<diretorio_saida>] [<nome do modelo>]
+if __name__ == '__main__':
+    diretorio_csv = sys.argv[1] if len(sys.argv) > 1 else os.path.join('..', 'data_sus', 'PySUS', 'infodengue')
+    diretorio_saida = sys.argv[2] if len(sys.argv) > 2 else os.path.join('..', 'data_sus', 'modelos', 'municipios')
+    treinar_diretorio(diretorio_csv, diretorio_saida, *sys.argv[3:4])
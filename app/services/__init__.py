@@ -1,120 +1,81 @@
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import pandas as pd
+from services.arquivos import gravar_atomico
 
-# Função para listar todos os arquivos CSV em um diretório
-def listar_arquivos_csv(diretorio):
-    return [f for f in os.listdir(diretorio) if f.endswith('.csv')]
-
-# Função para processar e modificar os arquivos CSV
-def limpar_linhas_csv(diretorio):
-    # Listando todos os arquivos CSV no diretório
-    arquivos_csv = listar_arquivos_csv(diretorio)
-    
-    for arquivo in arquivos_csv:
-        # Caminho completo do arquivo
-        caminho_arquivo = os.path.join(diretorio, arquivo)
-        
-        # Lendo o arquivo CSV em um DataFrame 
-        df = pd.read_csv(caminho_arquivo)
-        # Removendo a primeira coluna (ou qualquer outra coluna específica)
-        df.drop(index=7, inplace=True)
-        df.drop(index=8, inplace=True)
-        df.drop(index=9, inplace=True)
-        df.drop(index=10, inplace=True)
-        df.drop(index=11, inplace=True)
-        df.drop(index=16, inplace=True)
-        df.drop(index=17, inplace=True)
-        df.drop(index=18, inplace=True)
-        df.drop(index=23, inplace=True)
-        df.drop(index=24, inplace=True)
-        df.drop(index=25, inplace=True)
-        df.drop(index=26, inplace=True)
-        df.drop(index=27, inplace=True)
-        df.drop(index=28, inplace=True)
-        # Salvando o DataFrame modificado de volta no arquivo CSV
-        df.to_csv(caminho_arquivo, index=False)
-        print(f"Arquivo {arquivo} modificado e salvo com novas colunas.")
-
-# Especificando o diretório onde estão os arquivos CSV
-diretorio_csv = '..\data_sus\PySUS\infodengue'
-
-# Chamando a função para processar os arquivos CSV
-limpar_linhas_csv(diretorio_csv)
-
+# Linhas removidas de cada arquivo (antes da transposição, cada linha é uma variável)
+LINHAS_REMOVIDAS = [7, 8, 9, 10, 11, 16, 17, 18, 23, 24, 25, 26, 27, 28]
 
+# Colunas climáticas cujos valores ausentes são preenchidos pela mediana do município
+COLUNAS_MEDIANA = ['tempmin', 'umidmax', 'umidmed', 'umidmin', 'tempmed', 'tempmax']
 
 
 # Função para listar todos os arquivos CSV em um diretório
 def listar_arquivos_csv(diretorio):
     return [f for f in os.listdir(diretorio) if f.endswith('.csv')]
 
-# Função para processar e modificar os arquivos CSV
-def invert_lines_columns(diretorio):
-    # Listando todos os arquivos CSV no diretório
+# Etapa 1: remover as linhas que não são usadas
+def limpar_linhas_csv(df):
+    return df.drop(index=LINHAS_REMOVIDAS)
+
+# Etapa 2: transpor o DataFrame, usando a primeira coluna como cabeçalho
+def invert_lines_columns(df):
+    df = df.T
+
+    # Agora, transformar a primeira linha (originalmente a primeira coluna) em cabeçalho
+    df.columns = df.iloc[0]  # Define a primeira linha como nomes das colunas
+
+    # Remover a linha que virou o cabeçalho
+    df = df[1:].reset_index(drop=True)
+
+    # Após a transposição as colunas ficam como texto; converter as numéricas
+    # (o mesmo que acontecia ao salvar e ler o CSV de novo entre as etapas)
+    for coluna in df.columns:
+        try:
+            df[coluna] = pd.to_numeric(df[coluna])
+        except (ValueError, TypeError):
+            pass
+    return df
+
+# Etapa 3: ordenar pela semana e preencher as colunas climáticas com a mediana
+def orientacao_media(df):
+    df = df.sort_values(['data_iniSE'])
+    for coluna in COLUNAS_MEDIANA:
+        if coluna in df.columns:
+            df[coluna] = df[coluna].fillna(df[coluna].median())
+    return df
+
+# Função para processar um arquivo: uma leitura, as três etapas e uma gravação atômica
+# Os valores são gravados como vieram da fonte; os tipos compactos do esquema só são aplicados
+# na leitura (ler_dataset, ingestao, API), já que o CSV é texto e arredondar aqui perderia precisão.
+def processar_arquivo(caminho_arquivo):
+    inicio = time.perf_counter()
+    df = pd.read_csv(caminho_arquivo)
+    df = orientacao_media(invert_lines_columns(limpar_linhas_csv(df)))
+
+    # Grava em um arquivo temporário no mesmo diretório e substitui o original de uma vez,
+    # para que uma falha no meio nunca deixe um CSV pela metade
+    def escrever(caminho_temporario):
+        with open(caminho_temporario, 'w', newline='', encoding='utf-8') as f:
+            df.to_csv(f, index=False)
+    gravar_atomico(caminho_arquivo, escrever)
+    return time.perf_counter() - inicio
+
+# Função para processar todos os arquivos CSV do diretório em paralelo (um processo por núcleo)
+def processar_diretorio(diretorio, max_workers=None):
     arquivos_csv = listar_arquivos_csv(diretorio)
-    
-    for arquivo in arquivos_csv:
-        # Caminho completo do arquivo
-        caminho_arquivo = os.path.join(diretorio, arquivo)
-        
-        # Lendo o arquivo CSV em um DataFrame sem cabeçalhos
-        df = pd.read_csv(caminho_arquivo)
-        
-        # Primeiro, vamos transpor o DataFrame
-        df = df.T
-
-        # Agora, transformar a primeira linha (originalmente a primeira coluna) em cabeçalho
-        df.columns = df.iloc[0]  # Define a primeira linha como nomes das colunas
-
-        # Remover a linha que virou o cabeçalho
-        df = df[1:].reset_index(drop=True)
-
-        # Salvando o DataFrame modificado de volta no arquivo CSV
-        df.to_csv(caminho_arquivo, index=False)
-        print(f"Arquivo {arquivo} modificado e salvo com novas colunas.")
-
-# Especificando o diretório onde estão os arquivos CSV
-diretorio_csv = '..\data_sus\PySUS\infodengue'
-
-# Chamando a função para processar os arquivos CSV
-invert_lines_columns(diretorio_csv)
-
-
-
-
-# Função para listar todos os arquivos CSV em um diretório
-def listar_arquivos_csv(diretorio):
-    return [f for f in os.listdir(diretorio) if f.endswith('.csv')]
-
-# Função para processar e modificar os arquivos CSV
-def orientacao_media(diretorio):
-    # Listando todos os arquivos CSV no diretório
-    arquivos_csv = listar_arquivos_csv(diretorio)
-    
-    for arquivo in arquivos_csv:
-        # Caminho completo do arquivo
-        caminho_arquivo = os.path.join(diretorio, arquivo)
-        
-        # Lendo o arquivo CSV em um DataFrame
-        df = pd.read_csv(caminho_arquivo)
-        df = df.sort_values(['data_iniSE'])
-        df['tempmin'].fillna(df['tempmin'].median(), inplace=True)
-        df['umidmax'].fillna(df['umidmax'].median(), inplace=True)
-        df['umidmed'].fillna(df['umidmed'].median(), inplace=True)
-        df['umidmin'].fillna(df['umidmin'].median(), inplace=True)
-        df['tempmed'].fillna(df['tempmed'].median(), inplace=True)
-        df['tempmax'].fillna(df['tempmax'].median(), inplace=True)
-        
-
-
-        # Salvando o DataFrame modificado de volta no arquivo CSV
-        df.to_csv(caminho_arquivo, index=False)
-        print(f"Arquivo {arquivo} modificado e salvo com novas colunas.")
-
-# Especificando o diretório onde estão os arquivos CSV
-diretorio_csv = '..\data_sus\PySUS\infodengue'
-
-# Chamando a função para processar os arquivos CSV
-orientacao_media(diretorio_csv)
-
+    tempos = {}
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futuros = {executor.submit(processar_arquivo, os.path.join(diretorio, arquivo)): arquivo for arquivo in arquivos_csv}
+        for futuro in as_completed(futuros):
+            arquivo = futuros[futuro]
+            try:
+                tempos[arquivo] = futuro.result()
+                print(f"Arquivo {arquivo} modificado e salvo com novas colunas ({tempos[arquivo]:.2f} s).")
+            except Exception as e:
+                print(f"Erro ao processar o arquivo {arquivo}: {e}")
+    print(f"{len(tempos)} de {len(arquivos_csv)} arquivos processados em {time.perf_counter() - inicio:.2f} s.")
+    return tempos
 
@@ -0,0 +1,11 @@
+import os
+import sys
+from services import processar_diretorio
+
+# Uso (a partir da pasta app): python -m services [<diretorio_csv>]
+if __name__ == '__main__':
+    # Especificando o diretório onde estão os arquivos CSV (ou passado como argumento)
+    diretorio_csv = sys.argv[1] if len(sys.argv) > 1 else os.path.join('..', 'data_sus', 'PySUS', 'infodengue')
+
+    # Chamando a função para processar os arquivos CSV
+    processar_diretorio(diretorio_csv)
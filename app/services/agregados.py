@@ -0,0 +1,27 @@
+import pandas as pd
+
+# Colunas com mínimo e máximo por estado e semana (faixas dos gráficos da aba "Análise por Município")
+COLUNAS_MIN_MAX = ['casos', 'incidência_100khab', 'disseminação', 'umidmed', 'umidmin', 'umidmax',
+                   'tempmed', 'tempmin', 'tempmax']
+
+
+# Função para construir o cubo de agregados indexado por (estado, data_week)
+def construir_cubo(df):
+    cubo = df.groupby(['estado', 'data_week'], observed=True).agg({coluna: ['min', 'max'] for coluna in COLUNAS_MIN_MAX})
+    return cubo.sort_index()
+
+
+# Função para recalcular o cubo a partir de uma semana, sem reagrupar as semanas anteriores
+# Usada quando semanas recentes são revisadas (um mínimo ou máximo antigo pode deixar de valer);
+# `df_recente` deve ter todas as linhas das semanas a partir de `semana_inicial`.
+def recalcular_cubo(cubo, semana_inicial, df_recente):
+    anteriores = cubo[cubo.index.get_level_values('data_week') < semana_inicial]
+    return pd.concat([anteriores, construir_cubo(df_recente)]).sort_index()
+
+
+# Função para recortar o cubo de um estado no período [data_inicial, data_final]
+# O resultado tem o mesmo formato do antigo df_min_max (coluna 'data_week' + pares (coluna, min/max)).
+def fatiar_cubo(cubo, estado, data_inicial, data_final):
+    if estado not in cubo.index.get_level_values('estado'):
+        return cubo.iloc[0:0].droplevel('estado').reset_index()
+    return cubo.loc[estado].loc[data_inicial:data_final].reset_index()
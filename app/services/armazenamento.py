@@ -0,0 +1,123 @@
+import glob
+import os
+import sys
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+from config.dependences import aplicar_schema, carregar_schema, dtypes_leitura
+
+# Esquema das partições do dataset colunar (layout hive: estado=RJ/ano=2024/)
+PARTICOES = pa.schema([('estado', pa.string()), ('ano', pa.int16())])
+
+
+# Função para verificar se existe um dataset Parquet no diretório
+def parquet_disponivel(diretorio):
+    return os.path.isdir(diretorio) and bool(glob.glob(os.path.join(diretorio, '**', '*.parquet'), recursive=True))
+
+
+# Função para abrir o dataset particionado (somente metadados, nada é lido ainda)
+def abrir_dataset(diretorio):
+    return ds.dataset(diretorio, format='parquet', partitioning=ds.partitioning(PARTICOES, flavor='hive'))
+
+
+# Função para converter um CSV (nacional ou de uma região) em Parquet particionado por estado e ano
+# Com um esquema (seção "schema" do cfg.json), as colunas são gravadas já nos tipos compactos.
+def converter_para_parquet(caminho_csv, diretorio_destino, schema=None, chunksize=500_000):
+    # Prefixo dos arquivos gerados, para que reconverter o mesmo CSV substitua apenas os seus arquivos
+    prefixo = os.path.splitext(os.path.basename(caminho_csv))[0]
+    for antigo in glob.glob(os.path.join(diretorio_destino, '**', f'{prefixo}-*.parquet'), recursive=True):
+        os.remove(antigo)
+
+    linhas = 0
+    dtype = dtypes_leitura(schema) if schema else None
+    for n, chunk in enumerate(pd.read_csv(caminho_csv, dtype=dtype, chunksize=chunksize)):
+        chunk = preparar_bloco(chunk, schema)
+        gravar_particoes(chunk, diretorio_destino, f'{prefixo}-{n}-{{i}}.parquet')
+        linhas += len(chunk)
+    return linhas
+
+
+# Função para preparar um bloco lido do CSV para o dataset: tipos do esquema, datas convertidas
+# e a coluna de partição 'ano' (linhas sem estado ou sem semana são descartadas)
+def preparar_bloco(chunk, schema=None):
+    chunk = chunk[chunk['estado'].notna()].copy()
+    if schema:
+        chunk = aplicar_schema(chunk, schema)
+    chunk['estado'] = chunk['estado'].astype(str)
+    chunk['data_week'] = pd.to_datetime(chunk['data_week'], errors='coerce')
+    chunk = chunk[chunk['data_week'].notna()]
+    chunk['ano'] = chunk['data_week'].dt.year.astype('int16')
+    return chunk
+
+
+# Função para gravar um bloco nas partições estado/ano; devolve os caminhos dos arquivos criados
+def gravar_particoes(chunk, diretorio_destino, basename_template):
+    arquivos = []
+    ds.write_dataset(
+        pa.Table.from_pandas(chunk, preserve_index=False),
+        diretorio_destino,
+        format='parquet',
+        partitioning=ds.partitioning(PARTICOES, flavor='hive'),
+        basename_template=basename_template,
+        existing_data_behavior='overwrite_or_ignore',
+        file_visitor=lambda arquivo: arquivos.append(arquivo.path),
+    )
+    return arquivos
+
+
+# Função para ler do dataset apenas as colunas e partições (estados/anos) necessárias
+def ler_parquet(diretorio, colunas=None, estados=None, anos=None):
+    dataset = abrir_dataset(diretorio)
+
+    filtro = None
+    if estados is not None:
+        filtro = ds.field('estado').isin([str(e) for e in estados])
+    if anos is not None:
+        filtro_anos = ds.field('ano').isin([int(a) for a in anos])
+        filtro = filtro_anos if filtro is None else filtro & filtro_anos
+
+    if colunas is None:
+        # Mesmas colunas do CSV original (a coluna de partição 'ano' é interna)
+        colunas = [c for c in dataset.schema.names if c != 'ano']
+    tabela = dataset.to_table(columns=list(colunas), filter=filtro)
+    return tabela.to_pandas()
+
+
+# Função para ler o dataset da seção "dados" do cfg.json já nos tipos compactos do esquema
+# Usa o dataset Parquet particionado (estado/ano) quando existir, lendo apenas as colunas e
+# partições pedidas; caso contrário, lê o CSV original.
+def ler_dataset(cfg_dados, schema, colunas=None, estados=None, anos=None):
+    if parquet_disponivel(cfg_dados['parquet_dengue']):
+        df = ler_parquet(cfg_dados['parquet_dengue'], colunas=colunas, estados=estados, anos=anos)
+    else:
+        usecols = None
+        if colunas is not None:
+            usecols = list(set(colunas) | ({'estado'} if estados is not None else set()) | ({'data_week'} if anos is not None else set()))
+        df = pd.read_csv(cfg_dados['csv_dengue'], usecols=usecols)
+        if estados is not None:
+            df = df[df['estado'].isin(estados)]
+        if anos is not None:
+            df = df[pd.to_datetime(df['data_week'], errors='coerce').dt.year.isin(anos)]
+        if colunas is not None:
+            df = df[list(colunas)]
+        df = df.reset_index(drop=True)
+    return aplicar_schema(df, schema)
+
+
+# Função para listar os anos disponíveis (lidos dos nomes das partições, sem abrir os arquivos)
+def anos_disponiveis(diretorio, estado=None):
+    dataset = abrir_dataset(diretorio)
+    filtro = ds.field('estado') == str(estado) if estado is not None else None
+    anos = set()
+    for fragmento in dataset.get_fragments(filter=filtro):
+        chaves = ds.get_partition_keys(fragmento.partition_expression)
+        if 'ano' in chaves:
+            anos.add(int(chaves['ano']))
+    return sorted(anos)
+
+
+if __name__ == '__main__':
+    # Uso (a partir da pasta app): python -m services.armazenamento <arquivo.csv> <diretorio_destino>
+    origem, destino = sys.argv[1], sys.argv[2]
+    total = converter_para_parquet(origem, destino, schema=carregar_schema())
+    print(f"Arquivo {origem} convertido: {total} linhas gravadas em {destino}.")
@@ -0,0 +1,47 @@
+import hashlib
+import json
+import os
+import tempfile
+
+
+# Função para calcular o hash do conteúdo de um arquivo (identifica a versão dos dados)
+def hash_arquivo(caminho, tamanho_bloco=1024 * 1024):
+    resumo = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b''):
+            resumo.update(bloco)
+    return resumo.hexdigest()
+
+
+# Função para gravar um arquivo de forma atômica: `escrever(caminho_temporario)` grava um arquivo
+# temporário no mesmo diretório, que vai para o disco (fsync) e então substitui o destino de uma vez,
+# para que uma falha no meio nunca deixe o arquivo pela metade.
+# O nome temporário começa com '_', que os datasets Parquet (pyarrow e DuckDB) ignoram.
+def gravar_atomico(caminho, escrever):
+    diretorio = os.path.dirname(caminho) or '.'
+    descritor, caminho_temporario = tempfile.mkstemp(dir=diretorio, prefix='_', suffix='.tmp')
+    os.close(descritor)
+    try:
+        escrever(caminho_temporario)
+        with open(caminho_temporario, 'rb') as f:
+            os.fsync(f.fileno())
+        os.replace(caminho_temporario, caminho)
+    except BaseException:
+        os.remove(caminho_temporario)
+        raise
+
+
+# Função para ler um arquivo JSON (manifestos); `padrao` é devolvido se ele ainda não existir
+def ler_json(caminho, padrao=None):
+    if not os.path.exists(caminho):
+        return padrao
+    with open(caminho, encoding='utf-8') as f:
+        return json.load(f)
+
+
+# Função para gravar um arquivo JSON de forma atômica
+def gravar_json(dados, caminho):
+    def escrever(caminho_temporario):
+        with open(caminho_temporario, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, ensure_ascii=False, indent=2, sort_keys=True)
+    gravar_atomico(caminho, escrever)
@@ -0,0 +1,187 @@
+import glob
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from config.dependences import aplicar_schema, carregar_config, carregar_schema, dtypes_leitura
+from services.armazenamento import PARTICOES, gravar_particoes, parquet_disponivel, preparar_bloco
+from services.arquivos import gravar_atomico, gravar_json, hash_arquivo, ler_json
+
+# Manifesto da atualização incremental, guardado na raiz do dataset Parquet
+# (arquivos iniciados por '_' não fazem parte do dataset para o pyarrow nem para o DuckDB)
+NOME_MANIFESTO = '_atualizacao.json'
+
+# Chave de uma linha do dataset: um município em uma semana epidemiológica
+CHAVE = ['municipio', 'data_week']
+
+
+# Função para ler o manifesto (versão atual, arquivos já vistos na pasta de entrada e lotes gravados)
+def ler_manifesto(diretorio_parquet):
+    return ler_json(os.path.join(diretorio_parquet, NOME_MANIFESTO), {'versao': 0, 'arquivos': {}, 'lotes': []})
+
+
+# Função para gravar o manifesto de forma atômica
+def gravar_manifesto(manifesto, diretorio_parquet):
+    gravar_json(manifesto, os.path.join(diretorio_parquet, NOME_MANIFESTO))
+
+
+# Função para listar os CSVs novos ou modificados da pasta de entrada, do mais antigo ao mais recente
+# Arquivos com a mesma data de modificação e o mesmo tamanho registrados no manifesto nem são abertos.
+def arquivos_pendentes(diretorio_entrada, manifesto):
+    pendentes = []
+    for caminho in sorted(glob.glob(os.path.join(diretorio_entrada, '*.csv')), key=os.path.getmtime):
+        info = os.stat(caminho)
+        registro = manifesto['arquivos'].get(os.path.basename(caminho))
+        if registro and registro['mtime_ns'] == info.st_mtime_ns and registro['tamanho'] == info.st_size:
+            continue
+        pendentes.append((caminho, info))
+    return pendentes
+
+
+# Função para montar a chave (município, semana) de cada linha, para comparar lotes e dados gravados
+def chaves(df):
+    return pd.MultiIndex.from_arrays([np.asarray(df['municipio'], dtype=object), pd.to_datetime(df['data_week'])])
+
+
+# Função para ler um arquivo da pasta de entrada (mesmas colunas do CSV nacional)
+# Se o arquivo repetir a mesma semana de um município, vale a última linha.
+def ler_lote(caminho, schema=None):
+    df = pd.read_csv(caminho, dtype=dtypes_leitura(schema) if schema else None)
+    df = preparar_bloco(df, schema)
+    return df.drop_duplicates(subset=CHAVE, keep='last').reset_index(drop=True)
+
+
+# Função para regravar um arquivo do dataset de forma atômica (removido se ficar vazio)
+# O temporário, gravado dentro da partição, tem nome ignorado pelo pyarrow e pelo DuckDB.
+def _regravar(caminho, tabela):
+    if tabela.num_rows == 0:
+        os.remove(caminho)
+        return
+    gravar_atomico(caminho, lambda caminho_temporario: pq.write_table(tabela, caminho_temporario))
+
+
+# Função para remover do dataset as linhas que o lote revisa (mesmo município e semana)
+# Só os arquivos das partições (estado/ano) tocadas pelo lote são abertos, lendo apenas as colunas da
+# chave; somente os arquivos com linhas revisadas são regravados. Devolve o número de linhas removidas.
+def remover_revisadas(df_lote, diretorio_parquet):
+    removidas = 0
+    for (estado, ano), df_particao in df_lote.groupby(['estado', 'ano'], observed=True):
+        chaves_lote = chaves(df_particao)
+        pasta = os.path.join(diretorio_parquet, f'estado={estado}', f'ano={ano}')
+        for caminho in glob.glob(os.path.join(pasta, '*.parquet')):
+            with pq.ParquetFile(caminho) as arquivo:
+                manter = ~chaves(arquivo.read(columns=CHAVE).to_pandas()).isin(chaves_lote)
+                if manter.all():
+                    continue
+                tabela = arquivo.read().filter(pa.array(manter))
+            removidas += int((~manter).sum())
+            _regravar(caminho, tabela)
+    return removidas
+
+
+# Função para gravar as linhas do lote nas partições estado/ano
+# Os arquivos são gravados com nomes provisórios ('_...parquet.tmp', ignorados pelo pyarrow e pelo DuckDB)
+# e só então renomeados, para que uma leitura durante a gravação nunca encontre um arquivo pela metade.
+def gravar_lote(df_lote, diretorio_parquet, prefixo):
+    arquivos = []
+    for provisorio in gravar_particoes(df_lote, diretorio_parquet, f'_{prefixo}-{{i}}.parquet.tmp'):
+        pasta, nome = os.path.split(provisorio)
+        arquivo = os.path.join(pasta, nome[1:-len('.tmp')])
+        os.replace(provisorio, arquivo)
+        arquivos.append(arquivo)
+    return arquivos
+
+
+# Função para apagar os temporários deixados por uma atualização interrompida
+def remover_provisorios(diretorio_parquet):
+    for provisorio in glob.glob(os.path.join(diretorio_parquet, '**', '_*.tmp'), recursive=True):
+        os.remove(provisorio)
+
+
+# Função para incorporar ao dataset Parquet os arquivos novos da pasta de entrada
+# Cada arquivo vira um lote: as linhas que ele revisa saem dos arquivos antigos e as suas linhas são
+# gravadas em arquivos próprios nas partições estado/ano. O custo é proporcional ao lote e às partições
+# que ele toca, não ao histórico inteiro. Devolve os lotes incorporados.
+def atualizar(diretorio_entrada, diretorio_parquet, schema=None):
+    if not parquet_disponivel(diretorio_parquet):
+        raise FileNotFoundError(f"Dataset Parquet não encontrado em {diretorio_parquet}; "
+                                "converta o CSV antes (python -m services.armazenamento).")
+    remover_provisorios(diretorio_parquet)
+    manifesto = ler_manifesto(diretorio_parquet)
+    lotes = []
+    for caminho, info in arquivos_pendentes(diretorio_entrada, manifesto):
+        nome = os.path.basename(caminho)
+        resumo = hash_arquivo(caminho)
+        registro = manifesto['arquivos'].get(nome)
+        # Só a data de modificação mudou (arquivo copiado de novo, por exemplo): nada a incorporar
+        if registro is None or registro['hash'] != resumo:
+            inicio = time.perf_counter()
+            df_lote = ler_lote(caminho, schema)
+            removidas = remover_revisadas(df_lote, diretorio_parquet)
+            versao = manifesto['versao'] + 1
+            arquivos = gravar_lote(df_lote, diretorio_parquet, f'semanas-{versao}') if len(df_lote) else []
+            lote = {
+                'versao': versao,
+                'arquivo': nome,
+                'hash': resumo,
+                'linhas': len(df_lote),
+                'revisadas': removidas,
+                'semanas': [str(df_lote['data_week'].min()), str(df_lote['data_week'].max())] if len(df_lote) else [],
+                'arquivos': sorted(os.path.relpath(arquivo, diretorio_parquet) for arquivo in arquivos),
+                'tempo_s': round(time.perf_counter() - inicio, 3),
+            }
+            manifesto['versao'] = versao
+            manifesto['lotes'].append(lote)
+            lotes.append(lote)
+        manifesto['arquivos'][nome] = {'hash': resumo, 'mtime_ns': info.st_mtime_ns, 'tamanho': info.st_size}
+        gravar_manifesto(manifesto, diretorio_parquet)
+    return lotes
+
+
+# Função para obter a versão atual do dataset (número do último lote incorporado)
+def versao_atual(diretorio_parquet):
+    return ler_manifesto(diretorio_parquet)['versao']
+
+
+# Função para listar os lotes incorporados depois da versão indicada
+def lotes_desde(diretorio_parquet, versao):
+    return [lote for lote in ler_manifesto(diretorio_parquet)['lotes'] if lote['versao'] > versao]
+
+
+# Função para ler apenas as linhas dos lotes indicados (só os arquivos gravados por eles)
+# Os lotes são lidos em ordem de versão; se dois lotes trazem a mesma semana de um município, vale o mais recente.
+def ler_lotes(diretorio_parquet, lotes, schema, colunas):
+    partes = []
+    for lote in lotes:
+        caminhos = [os.path.join(diretorio_parquet, arquivo) for arquivo in lote['arquivos']]
+        caminhos = [caminho for caminho in caminhos if os.path.exists(caminho)]
+        if not caminhos:
+            continue
+        dataset = ds.dataset(caminhos, format='parquet', partitioning=ds.partitioning(PARTICOES, flavor='hive'),
+                             partition_base_dir=diretorio_parquet)
+        partes.append(dataset.to_table(columns=list(colunas)).to_pandas())
+    if not partes:
+        return aplicar_schema(pd.DataFrame(columns=list(colunas)), schema)
+    df = pd.concat([parte.astype({'municipio': str, 'estado': str}) for parte in partes], ignore_index=True)
+    df = df.drop_duplicates(subset=CHAVE, keep='last').reset_index(drop=True)
+    return aplicar_schema(df, schema)
+
+
+if __name__ == '__main__':
+    # Uso (a partir da pasta app): python -m services.atualizacao [<diretorio_entrada>] [<intervalo_s>]
+    # Com um intervalo, a pasta é verificada continuamente; sem ele, uma única vez.
+    cfg_dados = carregar_config()['dados']
+    entrada = sys.argv[1] if len(sys.argv) > 1 else os.path.join('..', cfg_dados['entrada_semanas'])
+    intervalo = float(sys.argv[2]) if len(sys.argv) > 2 else None
+    destino = os.path.join('..', cfg_dados['parquet_dengue'])
+    while True:
+        for lote in atualizar(entrada, destino, schema=carregar_schema()):
+            print(f"Lote {lote['versao']} ({lote['arquivo']}): {lote['linhas']} linhas, "
+                  f"{lote['revisadas']} revisadas, semanas {lote['semanas']}, {lote['tempo_s']} s.")
+        if intervalo is None:
+            break
+        time.sleep(intervalo)
@@ -0,0 +1,111 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+# Cache em disco (SQLite) dos resultados dos scrapers, por (fonte, estado, município)
+# - cada fonte tem seu TTL; depois dele o resultado fica "velho" mas ainda é servido na hora
+#   enquanto uma atualização roda em segundo plano (stale-while-revalidate);
+# - resultados mais velhos que max_stale_segundos são descartados e buscados de novo;
+# - o tamanho total é limitado, removendo primeiro os itens acessados há mais tempo (LRU).
+class CacheNoticias:
+
+    def __init__(self, caminho, ttl_segundos, ttl_padrao=3600, max_stale_segundos=7 * 86400, tamanho_maximo_mb=50, max_workers=2):
+        self.caminho = caminho
+        self.ttl_segundos = ttl_segundos
+        self.ttl_padrao = ttl_padrao
+        self.max_stale_segundos = max_stale_segundos
+        self.tamanho_maximo = int(tamanho_maximo_mb * 1024 * 1024)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._em_atualizacao = set()
+        self._trava = threading.Lock()
+
+        diretorio = os.path.dirname(caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        with self._conectar() as con:
+            con.execute('PRAGMA journal_mode=WAL')
+            con.execute('''CREATE TABLE IF NOT EXISTS cache (
+                               fonte TEXT, estado TEXT, municipio TEXT, valor TEXT,
+                               criado_em REAL, acessado_em REAL, tamanho INTEGER,
+                               PRIMARY KEY (fonte, estado, municipio))''')
+            con.execute('CREATE INDEX IF NOT EXISTS idx_cache_acesso ON cache (acessado_em)')
+
+    # Conexão curta por operação (uma transação), segura entre threads e processos
+    @contextmanager
+    def _conectar(self):
+        con = sqlite3.connect(self.caminho, timeout=30)
+        try:
+            with con:
+                yield con
+        finally:
+            con.close()
+
+    @staticmethod
+    def _chave(fonte, estado, municipio):
+        return (fonte, estado or '', municipio or '')
+
+    def _ler(self, chave):
+        with self._conectar() as con:
+            linha = con.execute('SELECT valor, criado_em FROM cache WHERE fonte=? AND estado=? AND municipio=?', chave).fetchone()
+            if linha is not None:
+                con.execute('UPDATE cache SET acessado_em=? WHERE fonte=? AND estado=? AND municipio=?', (time.time(), *chave))
+        return linha
+
+    def _gravar(self, chave, valor):
+        texto = json.dumps(valor, ensure_ascii=False)
+        agora = time.time()
+        with self._conectar() as con:
+            con.execute('INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?, ?, ?)', (*chave, texto, agora, agora, len(texto.encode('utf-8'))))
+            self._despejar(con)
+
+    # Remove os itens menos acessados até o total caber no limite
+    def _despejar(self, con):
+        total = con.execute('SELECT COALESCE(SUM(tamanho), 0) FROM cache').fetchone()[0]
+        if total <= self.tamanho_maximo:
+            return
+        for fonte, estado, municipio, tamanho in con.execute('SELECT fonte, estado, municipio, tamanho FROM cache ORDER BY acessado_em').fetchall():
+            con.execute('DELETE FROM cache WHERE fonte=? AND estado=? AND municipio=?', (fonte, estado, municipio))
+            total -= tamanho
+            if total <= self.tamanho_maximo:
+                break
+
+    def _atualizar(self, chave, funcao):
+        try:
+            self._gravar(chave, funcao())
+        except Exception:
+            logger.exception('Falha ao atualizar o cache de %s', chave)
+        finally:
+            with self._trava:
+                self._em_atualizacao.discard(chave)
+
+    # Agenda uma atualização em segundo plano (no máximo uma por chave ao mesmo tempo)
+    def _agendar(self, chave, funcao):
+        with self._trava:
+            if chave in self._em_atualizacao:
+                return
+            self._em_atualizacao.add(chave)
+        self._executor.submit(self._atualizar, chave, funcao)
+
+    # Função principal: devolve o resultado em cache ou executa `funcao` (sem argumentos) para obtê-lo
+    def obter(self, fonte, estado, municipio, funcao):
+        chave = self._chave(fonte, estado, municipio)
+        linha = self._ler(chave)
+        if linha is not None:
+            valor, criado_em = linha
+            idade = time.time() - criado_em
+            if idade < self.ttl_segundos.get(fonte, self.ttl_padrao):
+                return json.loads(valor)
+            if idade < self.max_stale_segundos:
+                self._agendar(chave, funcao)
+                return json.loads(valor)
+        valor = funcao()
+        self._gravar(chave, valor)
+        return valor
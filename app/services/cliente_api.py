@@ -0,0 +1,86 @@
+from urllib.parse import quote
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# Cliente da API de dados de dengue com pool de conexões (keep-alive), timeouts e novas tentativas
+# Uma única instância deve ser reaproveitada entre as execuções do Streamlit.
+class ClienteAPI:
+
+    def __init__(self, url_base, timeout_conexao=3.05, timeout_leitura=30, tentativas=3, tamanho_pool=10, lote_maximo=200):
+        self.url_base = url_base.rstrip('/')
+        self.timeout = (timeout_conexao, timeout_leitura)
+        self.lote_maximo = lote_maximo
+
+        # As rotas são idempotentes (POST grava por município/semana), então todas podem ser repetidas
+        retry = Retry(total=tentativas, backoff_factor=0.3, status_forcelist=(502, 503, 504),
+                      allowed_methods=frozenset({'GET', 'POST', 'PUT', 'DELETE'}))
+        adaptador = HTTPAdapter(pool_connections=tamanho_pool, pool_maxsize=tamanho_pool, max_retries=retry)
+        self.sessao = requests.Session()
+        self.sessao.mount('http://', adaptador)
+        self.sessao.mount('https://', adaptador)
+
+    # Função para criar o cliente a partir da seção "api" do cfg.json
+    @classmethod
+    def da_config(cls, cfg_api):
+        return cls(**cfg_api)
+
+    def _requisitar(self, metodo, caminho, **kwargs):
+        response = self.sessao.request(metodo, f"{self.url_base}{caminho}", timeout=self.timeout, **kwargs)
+        return response.json()
+
+    # Função para dividir listas grandes em lotes (limite de tamanho da URL/requisição)
+    def _lotes(self, valores):
+        valores = list(valores)
+        for inicio in range(0, len(valores), self.lote_maximo):
+            yield valores[inicio:inicio + self.lote_maximo]
+
+    # Caminho de um município na URL: o nome é codificado por inteiro ('/', '?', '#', '%' e acentos)
+    @staticmethod
+    def _caminho_item(municipio):
+        return f"/items/{quote(municipio, safe='')}"
+
+    # Operações de um único município
+    def get_item(self, municipio):
+        return self._requisitar('GET', self._caminho_item(municipio))
+
+    def create_item(self, item):
+        return self._requisitar('POST', "/items", json=item)
+
+    def update_item(self, municipio, item):
+        return self._requisitar('PUT', self._caminho_item(municipio), json=item)
+
+    def delete_item(self, municipio):
+        return self._requisitar('DELETE', self._caminho_item(municipio))
+
+    # Operações em lote (uma requisição por lote de até lote_maximo municípios)
+    def get_items(self, municipios):
+        resultado = {}
+        for lote in self._lotes(municipios):
+            resultado.update(self._requisitar('GET', "/items/batch", params={'municipios': lote}))
+        return resultado
+
+    def upsert_items(self, items):
+        gravados = 0
+        for lote in self._lotes(items):
+            gravados += self._requisitar('POST', "/items/batch", json=lote)['gravados']
+        return {"gravados": gravados}
+
+    def delete_items(self, municipios):
+        removidos = 0
+        for lote in self._lotes(municipios):
+            removidos += self._requisitar('DELETE', "/items/batch", json={'municipios': lote})['removidos']
+        return {"removidos": removidos}
+
+    # Previsão de casos para vários pares (município, semana), em lotes de até lote_maximo pares
+    def forecast(self, pares):
+        resultado = {"versao": None, "previsoes": []}
+        for lote in self._lotes(pares):
+            resposta = self._requisitar('POST', "/forecast", json={'pares': [
+                {'municipio': municipio, 'data_week': data_week} for municipio, data_week in lote]})
+            if 'error' in resposta:
+                return resposta
+            resultado["versao"] = resposta["versao"]
+            resultado["previsoes"].extend(resposta["previsoes"])
+        return resultado
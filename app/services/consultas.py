@@ -0,0 +1,142 @@
+import glob
+import os
+import tempfile
+import duckdb
+from config.dependences import aplicar_schema
+from services.armazenamento import parquet_disponivel
+from services.mapa import arredondar
+
+# Funções de agregação do pandas (usadas em AGREGACOES_UPLOAD/AGREGACOES_MAPA) e o equivalente em SQL
+# ('first' e 'last' seguem a ordem das semanas, ignorando valores ausentes, como no agregar_por_municipio)
+AGREGACOES_SQL = {
+    'sum': 'COALESCE(SUM({c}), 0)',
+    'mean': 'AVG({c})',
+    'first': 'arg_min({c}, data_week) FILTER (WHERE {c} IS NOT NULL)',
+    'last': 'arg_max({c}, data_week) FILTER (WHERE {c} IS NOT NULL)',
+}
+
+# Opções do COPY do DuckDB para cada formato de exportação (mesmos nomes de services.exportacao.FORMATOS)
+FORMATOS_COPY = {
+    'CSV (gzip)': "FORMAT csv, HEADER true, COMPRESSION gzip",
+    'Parquet': "FORMAT parquet",
+}
+
+
+def _coluna(nome):
+    return '"' + nome.replace('"', '""') + '"'
+
+
+# Motor de consultas (DuckDB) sobre o corpus nacional, lido direto dos arquivos, sem upload
+# Usa o dataset Parquet particionado por estado/ano quando existir (só as partições filtradas são lidas);
+# caso contrário, os CSVs das regiões. Filtros, agregações e exportação rodam no DuckDB, que usa o disco
+# quando a consulta não cabe no limite de memória.
+class MotorConsultas:
+
+    def __init__(self, origem, memoria_maxima='2GB', diretorio_temporario=None, threads=None):
+        self._con = duckdb.connect()
+        self._con.execute(f"SET memory_limit='{memoria_maxima}'")
+        if diretorio_temporario:
+            os.makedirs(diretorio_temporario, exist_ok=True)
+            self._con.execute(f"SET temp_directory='{diretorio_temporario}'")
+        if threads:
+            self._con.execute(f"SET threads={int(threads)}")
+        self._con.execute(f"CREATE VIEW dengue AS SELECT * REPLACE (CAST(data_week AS TIMESTAMP) AS data_week) FROM {origem}")
+        self._colunas = [linha[0] for linha in self._con.execute('DESCRIBE dengue').fetchall() if linha[0] != 'ano']
+
+    # Função para criar o motor a partir das seções "dados" e "consultas" do cfg.json (None se não houver dados)
+    @classmethod
+    def da_config(cls, cfg_dados, cfg_consultas):
+        if parquet_disponivel(cfg_dados['parquet_dengue']):
+            caminho = os.path.join(cfg_dados['parquet_dengue'], '**', '*.parquet').replace("'", "''")
+            origem = f"read_parquet('{caminho}', hive_partitioning=true)"
+        elif glob.glob(cfg_dados['csv_regioes']):
+            origem = f"read_csv('{cfg_dados['csv_regioes']}', union_by_name=true)"
+        else:
+            return None
+        return cls(origem, cfg_consultas['memoria_maxima'], cfg_consultas['diretorio_temporario'], cfg_consultas['threads'])
+
+    # Cada consulta usa o seu cursor, então o motor pode ser compartilhado entre as sessões (threads)
+    def _executar(self, sql, parametros=()):
+        return self._con.cursor().execute(sql, list(parametros))
+
+    # Monta o WHERE dos filtros da aba (listas vazias não selecionam nada, como nos multiselects)
+    @staticmethod
+    def _filtros(estados=None, municipios=None, data_inicial=None, data_final=None):
+        condicoes, parametros = [], []
+        for coluna, valores in (('estado', estados), ('municipio', municipios)):
+            if valores is None:
+                continue
+            if not valores:
+                condicoes.append('FALSE')
+                continue
+            condicoes.append(f"{coluna} IN ({', '.join('?' for _ in valores)})")
+            parametros.extend(str(valor) for valor in valores)
+        if data_inicial is not None:
+            condicoes.append('data_week >= CAST(? AS TIMESTAMP)')
+            parametros.append(str(data_inicial))
+        if data_final is not None:
+            condicoes.append('data_week <= CAST(? AS TIMESTAMP)')
+            parametros.append(str(data_final))
+        return ('WHERE ' + ' AND '.join(condicoes)) if condicoes else '', parametros
+
+    def colunas(self):
+        return list(self._colunas)
+
+    def estados(self):
+        return [linha[0] for linha in self._executar('SELECT DISTINCT estado FROM dengue WHERE estado IS NOT NULL ORDER BY 1').fetchall()]
+
+    def municipios(self, estados):
+        where, parametros = self._filtros(estados=estados)
+        return [linha[0] for linha in self._executar(
+            f'SELECT DISTINCT municipio FROM dengue {where} ORDER BY 1', parametros).fetchall()]
+
+    def contar(self, **filtros):
+        where, parametros = self._filtros(**filtros)
+        return self._executar(f'SELECT COUNT(*) FROM dengue {where}', parametros).fetchone()[0]
+
+    def intervalo_datas(self, **filtros):
+        where, parametros = self._filtros(**filtros)
+        return self._executar(f'SELECT MIN(data_week), MAX(data_week) FROM dengue {where}', parametros).fetchone()
+
+    def _consulta(self, colunas=None, **filtros):
+        where, parametros = self._filtros(**filtros)
+        selecao = ', '.join(_coluna(c) for c in (colunas or self._colunas))
+        return f'SELECT {selecao} FROM dengue {where}', parametros
+
+    # Função para ler as linhas filtradas (no máximo `limite`), já nos tipos compactos do esquema
+    def filtrar(self, schema, colunas=None, limite=None, **filtros):
+        sql, parametros = self._consulta(colunas, **filtros)
+        if limite is not None:
+            sql += f' LIMIT {int(limite)}'
+        return aplicar_schema(self._executar(sql, parametros).df(), schema)
+
+    # Função para agregar por município no período, como services.mapa.agregar_por_municipio
+    def _sql_por_municipio(self, agregacoes, where):
+        expressoes = [f'{AGREGACOES_SQL[funcao].format(c=_coluna(coluna))} AS {_coluna(coluna)}'
+                      for coluna, funcao in agregacoes.items() if coluna in self._colunas]
+        return f"SELECT municipio, {', '.join(expressoes)} FROM dengue {where} GROUP BY municipio"
+
+    # Mesmo resultado de services.mapa.preparar_mapa, calculado no DuckDB: um ponto por município ou,
+    # acima do limiar de pontos, células de grade. Devolve (modo, dados).
+    def preparar_mapa(self, agregacoes, cfg_mapa, **filtros):
+        where, parametros = self._filtros(**filtros)
+        pontos = self._sql_por_municipio(agregacoes, where)
+        n_pontos = self._executar(f'SELECT COUNT(*) FROM ({pontos})', parametros).fetchone()[0]
+        if n_pontos <= cfg_mapa['limiar_pontos']:
+            dados = self._executar(f'{pontos} ORDER BY municipio', parametros).df()
+            return 'pontos', arredondar(dados, cfg_mapa['casas_decimais'])
+
+        tamanho = float(cfg_mapa['tamanho_celula_graus'])
+        somas = ''.join(f', COALESCE(SUM({_coluna(c)}), 0) AS {_coluna(c)}' for c in ('casos', 'casos_est') if c in agregacoes)
+        grade = (f'SELECT FLOOR(longitude / {tamanho}) * {tamanho} AS longitude, FLOOR(latitude / {tamanho}) * {tamanho} AS latitude, '
+                 f'COUNT(DISTINCT municipio) AS municipios{somas} FROM ({pontos}) GROUP BY 1, 2 ORDER BY 1, 2')
+        return 'grade', arredondar(self._executar(grade, parametros).df(), cfg_mapa['casas_decimais'])
+
+    # Função para exportar as linhas filtradas direto do DuckDB para o arquivo (sem passar pelo pandas)
+    def exportar(self, formato, colunas=None, **filtros):
+        sql, parametros = self._consulta(colunas, **filtros)
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, 'exportacao')
+            self._executar(f"COPY ({sql}) TO '{caminho}' ({FORMATOS_COPY[formato]})", parametros)
+            with open(caminho, 'rb') as f:
+                return f.read()
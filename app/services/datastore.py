@@ -0,0 +1,109 @@
+import threading
+import numpy as np
+from services.agregados import construir_cubo, recalcular_cubo
+from services.atualizacao import chaves
+from services.ingestao import concatenar_blocos
+
+
+# Dados da aba "Análise por Município" organizados para consultas rápidas, construído uma vez por dataset
+# - relação município -> estado em um dicionário;
+# - uma partição contígua por estado, ordenada por data_week (carregada na primeira consulta ao estado);
+# - janelas de tempo recortadas com searchsorted, sem máscaras sobre todas as linhas.
+# `carregar_particao(estado)` deve devolver as linhas do estado com data_week já em datetime.
+# `versao` é a versão do dataset (atualização incremental) refletida pelo DataStore.
+class DataStore:
+
+    def __init__(self, municipios, carregar_particao, versao=0):
+        self.municipio_estado = dict(zip(municipios['municipio'].astype(str), municipios['estado'].astype(str)))
+        self._municipios = sorted(self.municipio_estado)
+        self._carregar_particao = carregar_particao
+        self._particoes = {}
+        # Uma trava por estado: a leitura de um estado não bloqueia as sessões que consultam os outros
+        self._travas = {}
+        self._trava = threading.Lock()
+        self._trava_lotes = threading.Lock()
+        self.versao = versao
+
+    def _trava_estado(self, estado):
+        with self._trava:
+            return self._travas.setdefault(estado, threading.Lock())
+
+    # Ordena a partição por semana (ordenação estável) e guarda o eixo de semanas para o searchsorted
+    @staticmethod
+    def _organizar(df_estado):
+        df_estado = df_estado[df_estado['data_week'].notna()]
+        df_estado = df_estado.sort_values('data_week', kind='stable').reset_index(drop=True)
+        return {'dados': df_estado, 'semanas': df_estado['data_week'].to_numpy(dtype='datetime64[ns]'), 'cubo': None}
+
+    def _particao(self, estado):
+        particao = self._particoes.get(estado)
+        if particao is None:
+            with self._trava_estado(estado):
+                particao = self._particoes.get(estado)
+                if particao is None:
+                    particao = self._particoes[estado] = self._organizar(self._carregar_particao(estado))
+        return particao
+
+    def municipios(self):
+        return self._municipios
+
+    def estado_de(self, municipio):
+        return self.municipio_estado[municipio]
+
+    # Todas as linhas do estado, em ordem de semana
+    def particao(self, estado):
+        return self._particao(estado)['dados']
+
+    def data_maxima(self, estado):
+        semanas = self._particao(estado)['semanas']
+        return semanas[-1] if len(semanas) else np.datetime64('NaT')
+
+    # Linhas do estado com data_week entre inicio e fim (inclusive), em O(log n) mais as linhas devolvidas
+    def janela(self, estado, inicio, fim):
+        particao = self._particao(estado)
+        semanas = particao['semanas']
+        ini = np.searchsorted(semanas, np.datetime64(inicio, 'ns'), side='left')
+        fim = np.searchsorted(semanas, np.datetime64(fim, 'ns'), side='right')
+        return particao['dados'].iloc[ini:fim]
+
+    # Cubo de mínimos e máximos por semana do estado (calculado uma vez por partição)
+    def cubo(self, estado):
+        particao = self._particao(estado)
+        if particao['cubo'] is None:
+            particao['cubo'] = construir_cubo(particao['dados'])
+        return particao['cubo']
+
+    # Função para incorporar um lote de semanas novas ou revisadas, sem recarregar os estados
+    # Só as partições já carregadas são alteradas (as demais lerão os arquivos atualizados). Cada partição
+    # é trocada por uma nova, então quem ainda usa a anterior continua vendo dados consistentes.
+    # Reaplicar um lote não muda nada: as linhas com o mesmo (município, semana) são substituídas.
+    # A trava de cada estado também é tomada aqui, então um estado que estava sendo lido recebe o lote
+    # logo depois da leitura, em vez de ficar sem ele.
+    def anexar(self, df_novo, versao):
+        with self._trava_lotes:
+            if versao <= self.versao:
+                return
+            for municipio, estado in zip(df_novo['municipio'], df_novo['estado']):
+                self.municipio_estado.setdefault(str(municipio), str(estado))
+            self._municipios = sorted(self.municipio_estado)
+            for estado, df_estado in df_novo.groupby('estado', observed=True, sort=False):
+                with self._trava_estado(str(estado)):
+                    particao = self._particoes.get(str(estado))
+                    if particao is not None:
+                        self._particoes[str(estado)] = self._incorporar(particao, df_estado)
+            self.versao = versao
+
+    # As revisões são de semanas recentes: só a cauda da partição a partir da primeira semana do lote
+    # é filtrada, reordenada e reagregada no cubo
+    def _incorporar(self, particao, df_novo):
+        dados = particao['dados']
+        semana_inicial = df_novo['data_week'].min()
+        ini = np.searchsorted(particao['semanas'], np.datetime64(semana_inicial, 'ns'), side='left')
+        cauda = dados.iloc[ini:]
+        revisadas = chaves(cauda).isin(chaves(df_novo))
+        cauda = self._organizar(concatenar_blocos([cauda[~revisadas], df_novo.reindex(columns=dados.columns)]))['dados']
+        dados = concatenar_blocos([dados.iloc[:ini], cauda])
+        cubo = particao['cubo']
+        if cubo is not None:
+            cubo = recalcular_cubo(cubo, semana_inicial, cauda)
+        return {'dados': dados, 'semanas': dados['data_week'].to_numpy(dtype='datetime64[ns]'), 'cubo': cubo}
@@ -0,0 +1,45 @@
+import gzip
+import hashlib
+import json
+import tempfile
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Formatos disponíveis: nome -> (extensão do arquivo, tipo MIME)
+FORMATOS = {
+    'CSV (gzip)': ('csv.gz', 'application/gzip'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet'),
+}
+
+
+# Função para gerar a chave de cache da exportação a partir do estado dos filtros
+def chave_exportacao(*filtros):
+    return hashlib.sha256(json.dumps(filtros, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+# Função para gravar o CSV compactado em blocos (o CSV completo nunca fica inteiro na memória)
+def _gravar_csv_gzip(df, destino, chunksize):
+    with gzip.GzipFile(fileobj=destino, mode='wb') as arquivo_gzip:
+        for inicio in range(0, max(len(df), 1), chunksize):
+            bloco = df.iloc[inicio:inicio + chunksize]
+            arquivo_gzip.write(bloco.to_csv(index=False, header=inicio == 0).encode('utf-8'))
+
+
+# Função para gravar o Parquet em blocos (um row group por bloco)
+def _gravar_parquet(df, destino, chunksize):
+    schema = pa.Schema.from_pandas(df.iloc[0:0], preserve_index=False)
+    with pq.ParquetWriter(destino, schema) as escritor:
+        for inicio in range(0, len(df), chunksize):
+            escritor.write_table(pa.Table.from_pandas(df.iloc[inicio:inicio + chunksize], schema=schema, preserve_index=False))
+
+
+# Função para exportar o DataFrame no formato escolhido
+# Os blocos são gravados em um arquivo temporário "spooled" (em memória até max_memoria_mb, depois em disco).
+def exportar(df, formato, chunksize=100_000, max_memoria_mb=32):
+    with tempfile.SpooledTemporaryFile(max_size=max_memoria_mb * 1024 * 1024) as destino:
+        if formato == 'Parquet':
+            _gravar_parquet(df, destino, chunksize)
+        else:
+            _gravar_csv_gzip(df, destino, chunksize)
+        destino.seek(0)
+        return destino.read()
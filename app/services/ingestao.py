@@ -0,0 +1,45 @@
+import pandas as pd
+from pandas.api.types import union_categoricals
+from config.dependences import aplicar_schema, dtypes_leitura
+
+
+# Função para ler o cabeçalho e os estados presentes no arquivo (lendo em blocos só a coluna 'estado')
+def ler_resumo(arquivo, chunksize=500_000):
+    arquivo.seek(0)
+    colunas = pd.read_csv(arquivo, nrows=0).columns.tolist()
+    arquivo.seek(0)
+    estados = set()
+    for chunk in pd.read_csv(arquivo, usecols=['estado'], dtype={'estado': str}, chunksize=chunksize):
+        estados.update(chunk['estado'].dropna().unique())
+    arquivo.seek(0)
+    return colunas, sorted(estados)
+
+
+# Função para juntar os blocos lidos, unificando as categorias das colunas categóricas
+def concatenar_blocos(blocos):
+    colunas_categoricas = [c for c in blocos[0].columns if isinstance(blocos[0][c].dtype, pd.CategoricalDtype)]
+    for coluna in colunas_categoricas:
+        categorias = union_categoricals([bloco[coluna] for bloco in blocos]).categories
+        for bloco in blocos:
+            bloco[coluna] = bloco[coluna].cat.set_categories(categorias)
+    return pd.concat(blocos, ignore_index=True)
+
+
+# Função para ler o arquivo em blocos, com tipos explícitos, mantendo apenas as linhas dos estados escolhidos
+# Cada bloco filtrado é convertido para os tipos compactos do esquema (colunas fora dele são inferidas).
+def ler_em_blocos(arquivo, estados, schema, chunksize=200_000):
+    arquivo.seek(0)
+    estados = set(estados)
+    blocos = []
+    for chunk in pd.read_csv(arquivo, dtype=dtypes_leitura(schema), chunksize=chunksize):
+        chunk = chunk[chunk['estado'].isin(estados)].copy()
+        if chunk.empty:
+            continue
+        blocos.append(aplicar_schema(chunk, schema))
+    if not blocos:
+        arquivo.seek(0)
+        vazio = pd.read_csv(arquivo, nrows=0)
+        arquivo.seek(0)
+        return vazio
+    arquivo.seek(0)
+    return concatenar_blocos(blocos)
@@ -0,0 +1,40 @@
+import numpy as np
+
+
+# Função para reduzir o período selecionado a um ponto por município
+# `agregacoes` mapeia coluna -> função do pandas ('sum', 'mean', 'first', 'last'...); 'last' usa a semana mais recente.
+def agregar_por_municipio(df, agregacoes):
+    if 'data_week' in df.columns:
+        df = df.sort_values('data_week')
+    especificacao = {coluna: (coluna, funcao) for coluna, funcao in agregacoes.items() if coluna in df.columns}
+    return df.groupby('municipio', observed=True).agg(**especificacao).reset_index()
+
+
+# Função para agrupar os pontos em células de uma grade regular (em graus), somando as colunas indicadas
+# Cada célula é representada pelo seu canto sudoeste, como espera a GridCellLayer do pydeck.
+def agregar_em_grade(df, tamanho_celula, colunas_soma):
+    longitude = np.floor(df['longitude'].to_numpy(dtype='float64') / tamanho_celula) * tamanho_celula
+    latitude = np.floor(df['latitude'].to_numpy(dtype='float64') / tamanho_celula) * tamanho_celula
+    especificacao = {coluna: (coluna, 'sum') for coluna in colunas_soma if coluna in df.columns}
+    grade = (df.assign(longitude=longitude, latitude=latitude)
+               .groupby(['longitude', 'latitude'])
+               .agg(municipios=('municipio', 'nunique'), **especificacao)
+               .reset_index())
+    return grade
+
+
+# Função para arredondar as colunas de ponto flutuante (menos bytes no JSON enviado ao navegador)
+# As colunas passam para float64 antes: um float32 arredondado (1.53) ainda vira 1.5299999713897705 no JSON.
+def arredondar(df, casas_decimais):
+    colunas = df.select_dtypes('floating').columns
+    return df.assign(**{coluna: df[coluna].astype('float64').round(casas_decimais) for coluna in colunas})
+
+
+# Função principal do mapa: um ponto por município ou, acima do limiar de pontos, células de grade
+# Devolve (modo, dados), com modo 'pontos' ou 'grade'.
+def preparar_mapa(df, agregacoes, cfg_mapa):
+    pontos = agregar_por_municipio(df, agregacoes)
+    if len(pontos) <= cfg_mapa['limiar_pontos']:
+        return 'pontos', arredondar(pontos, cfg_mapa['casas_decimais'])
+    grade = agregar_em_grade(pontos, cfg_mapa['tamanho_celula_graus'], ['casos', 'casos_est'])
+    return 'grade', arredondar(grade, cfg_mapa['casas_decimais'])
@@ -0,0 +1,107 @@
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+# Tempos das etapas (spans) de uma execução do script do Streamlit
+# Cada span é registrado no log como um JSON de uma linha e guardado para a barra lateral de depuração.
+class Medidor:
+
+    def __init__(self):
+        self.execucao = uuid.uuid4().hex[:8]
+        self.spans = []
+
+    @contextmanager
+    def span(self, nome, **atributos):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            registro = {'execucao': self.execucao, 'span': nome,
+                        'duracao_ms': round((time.perf_counter() - inicio) * 1000, 2), **atributos}
+            self.spans.append(registro)
+            logger.info(json.dumps(registro, ensure_ascii=False, default=str))
+
+    # Função para montar a tabela de spans da execução (para exibição)
+    def tabela(self):
+        return pd.DataFrame(self.spans, columns=['span', 'duracao_ms'])
+
+
+# Histograma com limites fixos (contagem por faixa, soma e total), como no formato do Prometheus
+class Histograma:
+
+    def __init__(self, limites):
+        self.limites = sorted(limites)
+        self.contagens = [0] * (len(self.limites) + 1)
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, valor):
+        self.contagens[bisect.bisect_left(self.limites, valor)] += 1
+        self.soma += valor
+        self.total += 1
+
+    # Linhas do formato texto do Prometheus (faixas acumuladas, +Inf, _sum e _count)
+    def linhas(self, nome, rotulos):
+        acumulado = 0
+        for limite, contagem in zip(self.limites + ['+Inf'], self.contagens):
+            acumulado += contagem
+            yield f'{nome}_bucket{{{rotulos},le="{limite}"}} {acumulado}'
+        yield f'{nome}_sum{{{rotulos}}} {self.soma}'
+        yield f'{nome}_count{{{rotulos}}} {self.total}'
+
+
+# Métricas das requisições da API por rota: latência, tamanho da requisição e da resposta
+# Cada worker do uvicorn guarda as suas e responde o /metrics só com elas, então toda série leva o
+# rótulo worker (pid do processo): assim cada série continua monotônica, qualquer que seja o worker
+# que atender a coleta, e o total sai da soma no Prometheus (sum without (worker) ...).
+class MetricasHTTP:
+
+    METRICAS = {
+        'http_request_duration_seconds': 'Latência das requisições, em segundos.',
+        'http_request_size_bytes': 'Tamanho do corpo das requisições, em bytes.',
+        'http_response_size_bytes': 'Tamanho do corpo das respostas, em bytes.',
+    }
+
+    def __init__(self, limites_latencia, limites_tamanho):
+        self.limites = {
+            'http_request_duration_seconds': limites_latencia,
+            'http_request_size_bytes': limites_tamanho,
+            'http_response_size_bytes': limites_tamanho,
+        }
+        self._series = {nome: {} for nome in self.METRICAS}
+        self._trava = threading.Lock()
+
+    def _observar(self, nome, rotulos, valor):
+        serie = self._series[nome].get(rotulos)
+        if serie is None:
+            serie = self._series[nome][rotulos] = Histograma(self.limites[nome])
+        serie.observar(valor)
+
+    def observar(self, metodo, rota, status, duracao, tamanho_requisicao, tamanho_resposta):
+        with self._trava:
+            self._observar('http_request_duration_seconds', (metodo, rota, str(status)), duracao)
+            self._observar('http_request_size_bytes', (metodo, rota), tamanho_requisicao)
+            self._observar('http_response_size_bytes', (metodo, rota), tamanho_resposta)
+
+    # Função para exportar todas as séries no formato texto do Prometheus
+    def texto(self):
+        linhas = []
+        worker = f'worker="{os.getpid()}"'
+        with self._trava:
+            for nome, descricao in self.METRICAS.items():
+                linhas.append(f'# HELP {nome} {descricao}')
+                linhas.append(f'# TYPE {nome} histogram')
+                for rotulos, serie in sorted(self._series[nome].items()):
+                    nomes_rotulos = ('method', 'route', 'status')[:len(rotulos)]
+                    texto_rotulos = ','.join([worker] + [f'{chave}="{valor}"' for chave, valor in zip(nomes_rotulos, rotulos)])
+                    linhas.extend(serie.linhas(nome, texto_rotulos))
+        return '\n'.join(linhas) + '\n'
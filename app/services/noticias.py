@@ -0,0 +1,136 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urljoin
+import requests
+from bs4 import BeautifulSoup
+
+# Endereços padrão das fontes (podem ser trocados, por exemplo, por um servidor local com HTML salvo)
+URL_DENGUE_INFO = 'https://www.gov.br/saude/pt-br/assuntos/saude-de-a-a-z/d/dengue'
+URL_CNN = 'https://www.cnnbrasil.com.br/tudo-sobre/dengue/'
+URL_G1_BUSCA = 'https://g1.globo.com/busca/'
+
+logger = logging.getLogger(__name__)
+
+CABECALHOS = {'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0'}
+
+
+# Função para filtrar notícias relacionadas à dengue
+def is_dengue_related(title, description):
+    keywords = ['dengue', 'zika', 'chikungunya', 'mosquito']
+    return any(keyword.lower() in title.lower() or keyword.lower() in description.lower() for keyword in keywords)
+
+
+# Configurações para o Selenium com Firefox (importado só quando uma página precisa de JavaScript)
+def setup_selenium():
+    from selenium import webdriver
+    from selenium.webdriver.firefox.options import Options
+    options = Options()
+    options.add_argument('-headless')
+    driver = webdriver.Firefox(options=options)
+    return driver
+
+
+# Função para obter o HTML renderizado pelo navegador, esperando o seletor aparecer (no máximo `timeout` s)
+def html_selenium(url, seletor, timeout=10):
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+    driver = setup_selenium()
+    try:
+        driver.get(url)
+        try:
+            WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.CSS_SELECTOR, seletor)))
+        except TimeoutException:
+            pass
+        return driver.page_source
+    finally:
+        driver.quit()
+
+
+# Função para obter a página: primeiro por HTTP simples; o Selenium só é usado se a página responder
+# mas o conteúdo esperado (seletor) não vier no HTML estático, ou seja, se ela depender de JavaScript.
+# Falhas de rede e respostas 4xx/5xx sobem para quem chamou (o cache serve o resultado anterior da fonte),
+# em vez de abrir um navegador para uma fonte fora do ar.
+def obter_pagina(url, seletor, params=None, timeout=10):
+    try:
+        response = requests.get(url, params=params, headers=CABECALHOS, timeout=timeout)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        logger.warning('Falha ao obter %s: %s', url, e)
+        raise
+    soup = BeautifulSoup(response.content, 'html.parser')
+    if soup.select_one(seletor) is not None:
+        return soup
+    url_completa = f"{url}?{urlencode(params)}" if params else url
+    return BeautifulSoup(html_selenium(url_completa, seletor, timeout), 'html.parser')
+
+
+def _texto(elemento, seletor):
+    encontrado = elemento.select_one(seletor)
+    return encontrado.get_text(strip=True) if encontrado is not None else ''
+
+
+# Função para obter o link absoluto de uma notícia (os sites usam links relativos, como /saude/...)
+def _link(link, url_pagina):
+    return urljoin(url_pagina, link.get('href', '')) if link is not None else ''
+
+
+# Parsers (recebem o HTML já carregado e o endereço da página, usado para resolver os links relativos;
+# podem ser usados diretamente com páginas salvas)
+def parse_dengue_info(soup):
+    return [p.get_text(strip=True) for p in soup.find_all('p')]
+
+
+def parse_cnn_news(soup, url_pagina=URL_CNN):
+    news_data = []
+    for element in soup.select('.home__list__item'):
+        link = element.find('a')
+        title = _texto(element, 'h3')
+        description = link.get('title', '') if link is not None else ''
+        if is_dengue_related(title, description):
+            news_data.append({'title': title, 'link': _link(link, url_pagina),
+                              'date': _texto(element, '.home__title__date'), 'description': description})
+    return news_data
+
+
+def parse_g1_news(soup, url_pagina=URL_G1_BUSCA):
+    news_data = []
+    for element in soup.select('.widget--info'):
+        link = element.find('a')
+        title = _texto(element, '.widget--info__title')
+        description = _texto(element, '.widget--info__description')
+        if is_dengue_related(title, description):
+            news_data.append({'title': title, 'link': _link(link, url_pagina),
+                              'date': _texto(element, '.widget--info__meta'), 'description': description})
+    return news_data
+
+
+# Função para fazer scraping da página de informações do Ministério da Saúde
+def scrape_dengue_info(url=URL_DENGUE_INFO, timeout=10):
+    return parse_dengue_info(obter_pagina(url, 'p', timeout=timeout))
+
+
+# Função para fazer scraping da CNN (notícias gerais)
+def scrape_cnn_news(url=URL_CNN, timeout=10):
+    return parse_cnn_news(obter_pagina(url, '.home__list__item', timeout=timeout), url)
+
+
+# Função para fazer scraping das notícias do estado e município (G1)
+def scrape_g1_news(state, city=None, url=URL_G1_BUSCA, timeout=10):
+    search_query = f"dengue {state}" + (f" {city}" if city else "")
+    return parse_g1_news(obter_pagina(url, '.widget--info', params={'q': search_query}, timeout=timeout), url)
+
+
+# Função para executar várias coletas ao mesmo tempo
+# Recebe {nome: (função, argumentos)} e devolve {nome: resultado}; erros são devolvidos como exceção.
+def coletar_em_paralelo(tarefas, max_workers=4):
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futuros = {nome: executor.submit(funcao, *args) for nome, (funcao, args) in tarefas.items()}
+    resultados = {}
+    for nome, futuro in futuros.items():
+        try:
+            resultados[nome] = futuro.result()
+        except Exception as e:
+            resultados[nome] = e
+    return resultados
@@ -0,0 +1,165 @@
+import threading
+import numpy as np
+import pandas as pd
+
+
+# Armazenamento em memória dos registros da API, com índices hash por município e por (município, semana)
+# Os dados ficam em colunas (arrays NumPy); as inclusões vão para um buffer de listas que é
+# incorporado às colunas quando cresce, o que mantém a inclusão em O(1) amortizado.
+class RegistroStore:
+
+    def __init__(self, df, tamanho_buffer=1024):
+        self.colunas = list(df.columns)
+        self._base = {coluna: df[coluna].to_numpy(copy=True) for coluna in self.colunas}
+        self._n_base = len(df)
+        self._buffer = {coluna: [] for coluna in self.colunas}
+        self._tamanho_buffer = tamanho_buffer
+        self._removidos = set()
+        self._por_municipio = {}
+        self._por_chave = {}
+        self._trava = threading.RLock()
+        for i in range(self._n_base):
+            self._indexar(i)
+
+    def __len__(self):
+        return self._n_base + len(self._buffer[self.colunas[0]]) - len(self._removidos)
+
+    # Funções internas de acesso por posição (base colunar ou buffer)
+    def _total(self):
+        return self._n_base + len(self._buffer[self.colunas[0]])
+
+    def _valor(self, i, coluna):
+        if i < self._n_base:
+            valor = self._base[coluna][i]
+        else:
+            valor = self._buffer[coluna][i - self._n_base]
+        if isinstance(valor, np.float32):
+            # float32 é devolvido pela sua menor representação decimal (0.2, e não 0.2000000029...)
+            return float(str(valor))
+        return valor.item() if isinstance(valor, np.generic) else valor
+
+    def _definir(self, i, coluna, valor):
+        if i < self._n_base:
+            self._base[coluna][i] = valor
+        else:
+            self._buffer[coluna][i - self._n_base] = valor
+
+    # Converte os valores de um registro para os tipos das colunas antes de gravá-los; inteiros fora
+    # da faixa do tipo são arredondados e limitados, como no aplicar_schema (umidade 300 -> 255 em uint8)
+    def _valores(self, registro):
+        valores = {}
+        for coluna in self.colunas:
+            valor = registro.get(coluna)
+            tipo = self._base[coluna].dtype
+            if valor is not None and tipo != object:
+                if np.issubdtype(tipo, np.integer):
+                    limites = np.iinfo(tipo)
+                    valor = min(max(round(valor), limites.min), limites.max)
+                valor = tipo.type(valor)
+            valores[coluna] = valor
+        return valores
+
+    def _registro(self, i):
+        return {coluna: self._valor(i, coluna) for coluna in self.colunas}
+
+    def _indexar(self, i):
+        municipio = self._valor(i, 'municipio')
+        self._por_municipio.setdefault(municipio, {})[i] = None
+        self._por_chave[(municipio, self._valor(i, 'data_week'))] = i
+
+    def _desindexar(self, i):
+        municipio = self._valor(i, 'municipio')
+        posicoes = self._por_municipio.get(municipio, {})
+        posicoes.pop(i, None)
+        if not posicoes:
+            self._por_municipio.pop(municipio, None)
+        chave = (municipio, self._valor(i, 'data_week'))
+        if self._por_chave.get(chave) == i:
+            del self._por_chave[chave]
+
+    # Incorpora o buffer às colunas; o limite cresce com a base, então cada linha é copiada O(1) vezes em média
+    def _descarregar(self):
+        for coluna in self.colunas:
+            base = self._base[coluna]
+            novos = np.asarray(self._buffer[coluna], dtype=object if base.dtype == object else None)
+            self._base[coluna] = np.concatenate([base, novos])
+            self._buffer[coluna] = []
+        self._n_base = len(self._base[self.colunas[0]])
+
+    # Leitura dos registros de um município
+    def buscar(self, municipio):
+        with self._trava:
+            return [self._registro(i) for i in self._por_municipio.get(municipio, {})]
+
+    # Leitura de um registro pela chave (município, semana)
+    def buscar_chave(self, municipio, data_week):
+        with self._trava:
+            i = self._por_chave.get((municipio, data_week))
+            return None if i is None else self._registro(i)
+
+    # Inclusão de um registro; se a chave (município, semana) já existir, o registro é atualizado no lugar
+    def inserir(self, registro):
+        with self._trava:
+            i = self._por_chave.get((registro['municipio'], registro['data_week']))
+            if i is not None:
+                self._substituir(i, registro)
+                return self._registro(i)
+            for coluna, valor in self._valores(registro).items():
+                self._buffer[coluna].append(valor)
+            i = self._total() - 1
+            self._indexar(i)
+            if len(self._buffer[self.colunas[0]]) >= max(self._tamanho_buffer, self._n_base // 2):
+                self._descarregar()
+            return self._registro(i)
+
+    # Inclusão em lote
+    def inserir_lote(self, registros):
+        with self._trava:
+            for registro in registros:
+                self.inserir(registro)
+        return len(registros)
+
+    # Substitui o registro da posição i; os valores são convertidos antes de qualquer alteração e,
+    # se uma gravação falhar, o registro anterior é restaurado e volta aos índices
+    def _substituir(self, i, registro):
+        valores = self._valores(registro)
+        anterior = {coluna: self._valor(i, coluna) for coluna in self.colunas}
+        self._desindexar(i)
+        try:
+            for coluna, valor in valores.items():
+                self._definir(i, coluna, valor)
+        except BaseException:
+            for coluna, valor in anterior.items():
+                self._definir(i, coluna, valor)
+            raise
+        finally:
+            self._indexar(i)
+
+    # Atualização no lugar de todos os registros de um município: cada registro mantém a sua chave
+    # (município, semana) e recebe os demais campos do novo registro
+    def atualizar_municipio(self, municipio, registro):
+        with self._trava:
+            posicoes = list(self._por_municipio.get(municipio, {}))
+            for i in posicoes:
+                self._substituir(i, {**registro, 'municipio': municipio, 'data_week': self._valor(i, 'data_week')})
+            return self._registro(posicoes[0]) if posicoes else None
+
+    # Remoção (lógica) de todos os registros de um município
+    def remover_municipio(self, municipio):
+        with self._trava:
+            posicoes = list(self._por_municipio.get(municipio, {}))
+            for i in posicoes:
+                self._desindexar(i)
+                self._removidos.add(i)
+            return len(posicoes)
+
+    # Remoção em lote
+    def remover_municipios(self, municipios):
+        with self._trava:
+            return sum(self.remover_municipio(municipio) for municipio in municipios)
+
+    # Exporta os registros ativos como DataFrame
+    def para_dataframe(self):
+        with self._trava:
+            ativos = [i for i in range(self._total()) if i not in self._removidos]
+            return pd.DataFrame([self._registro(i) for i in ativos], columns=self.colunas)
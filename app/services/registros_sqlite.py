@@ -0,0 +1,136 @@
+import os
+import queue
+import sqlite3
+from contextlib import contextmanager
+import pandas as pd
+
+# Tipos SQLite de cada tipo Python dos campos do modelo Item
+TIPOS_SQL = {int: 'INTEGER', float: 'REAL', str: 'TEXT'}
+
+
+# Armazenamento durável dos registros da API em SQLite (modo WAL), com a mesma interface do RegistroStore
+# Cada registro é único por (município, semana); há índices por município, estado e semana.
+# Vários processos (workers do uvicorn) podem usar o mesmo arquivo: o SQLite serializa as escritas
+# e, em WAL, as leituras não esperam por elas.
+class RegistroSQLite:
+
+    def __init__(self, caminho, colunas, semente=None, tamanho_pool=8):
+        self.caminho = caminho
+        self.colunas = list(colunas)
+        self._pool = queue.LifoQueue(maxsize=tamanho_pool)
+        self._nomes = ', '.join(f'"{coluna}"' for coluna in self.colunas)
+        self._marcadores = ', '.join('?' for _ in self.colunas)
+        self._atribuicoes = ', '.join(f'"{coluna}"=excluded."{coluna}"' for coluna in self.colunas)
+
+        diretorio = os.path.dirname(caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        with self._conectar() as con:
+            # Cria a tabela (e grava os registros iniciais) uma única vez, mesmo com vários workers subindo juntos
+            con.execute('BEGIN IMMEDIATE')
+            existe = con.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='registros'").fetchone()
+            if not existe:
+                definicoes = ', '.join(f'"{coluna}" {tipo}' for coluna, tipo in colunas.items())
+                con.execute(f'CREATE TABLE registros ({definicoes}, PRIMARY KEY (municipio, data_week))')
+                con.execute('CREATE INDEX idx_registros_estado ON registros (estado)')
+                con.execute('CREATE INDEX idx_registros_semana ON registros (data_week)')
+                if semente is not None:
+                    con.executemany(self._sql_inserir(), self._linhas(semente.to_dict('records')))
+
+    # Conexões reaproveitadas entre as requisições (uma por thread em uso, até tamanho_pool guardadas)
+    def _nova_conexao(self):
+        con = sqlite3.connect(self.caminho, timeout=30, check_same_thread=False, isolation_level=None)
+        con.execute('PRAGMA journal_mode=WAL')
+        con.execute('PRAGMA synchronous=NORMAL')
+        return con
+
+    # Cada uso é uma transação: confirmada no fim do bloco ou desfeita em caso de erro
+    @contextmanager
+    def _conectar(self):
+        try:
+            con = self._pool.get_nowait()
+        except queue.Empty:
+            con = self._nova_conexao()
+        try:
+            yield con
+            if con.in_transaction:
+                con.execute('COMMIT')
+        except BaseException:
+            if con.in_transaction:
+                con.execute('ROLLBACK')
+            raise
+        finally:
+            try:
+                self._pool.put_nowait(con)
+            except queue.Full:
+                con.close()
+
+    def _sql_inserir(self):
+        return (f'INSERT INTO registros ({self._nomes}) VALUES ({self._marcadores}) '
+                f'ON CONFLICT (municipio, data_week) DO UPDATE SET {self._atribuicoes}')
+
+    def _linhas(self, registros):
+        return [tuple(registro.get(coluna) for coluna in self.colunas) for registro in registros]
+
+    def _registros(self, cursor):
+        return [dict(zip(self.colunas, linha)) for linha in cursor.fetchall()]
+
+    def __len__(self):
+        with self._conectar() as con:
+            return con.execute('SELECT COUNT(*) FROM registros').fetchone()[0]
+
+    # Leitura dos registros de um município
+    def buscar(self, municipio):
+        with self._conectar() as con:
+            return self._registros(con.execute(f'SELECT {self._nomes} FROM registros WHERE municipio=? ORDER BY rowid', (municipio,)))
+
+    # Leitura de um registro pela chave (município, semana)
+    def buscar_chave(self, municipio, data_week):
+        with self._conectar() as con:
+            encontrados = self._registros(con.execute(
+                f'SELECT {self._nomes} FROM registros WHERE municipio=? AND data_week=?', (municipio, data_week)))
+        return encontrados[0] if encontrados else None
+
+    # Inclusão de um registro; se a chave (município, semana) já existir, o registro é atualizado no lugar
+    def inserir(self, registro):
+        with self._conectar() as con:
+            con.execute(self._sql_inserir(), self._linhas([registro])[0])
+        return self.buscar_chave(registro['municipio'], registro['data_week'])
+
+    # Inclusão em lote, em uma única transação
+    def inserir_lote(self, registros):
+        with self._conectar() as con:
+            con.execute('BEGIN IMMEDIATE')
+            con.executemany(self._sql_inserir(), self._linhas(registros))
+        return len(registros)
+
+    # Atualização de todos os registros de um município: cada registro mantém a sua chave
+    # (município, semana) e recebe os demais campos do novo registro, como no RegistroStore
+    # O registro devolvido é lido na mesma transação, antes que outro worker possa remover o município.
+    def atualizar_municipio(self, municipio, registro):
+        colunas = [coluna for coluna in self.colunas if coluna not in ('municipio', 'data_week')]
+        atribuicoes = ', '.join(f'"{coluna}"=?' for coluna in colunas)
+        with self._conectar() as con:
+            con.execute('BEGIN IMMEDIATE')
+            con.execute(f'UPDATE registros SET {atribuicoes} WHERE municipio=?',
+                        (*(registro.get(coluna) for coluna in colunas), municipio))
+            atualizados = self._registros(con.execute(
+                f'SELECT {self._nomes} FROM registros WHERE municipio=? ORDER BY rowid LIMIT 1', (municipio,)))
+        return atualizados[0] if atualizados else None
+
+    # Remoção de todos os registros de um município
+    def remover_municipio(self, municipio):
+        return self.remover_municipios([municipio])
+
+    # Remoção em lote, em uma única transação
+    def remover_municipios(self, municipios):
+        with self._conectar() as con:
+            con.execute('BEGIN IMMEDIATE')
+            antes = con.total_changes
+            con.executemany('DELETE FROM registros WHERE municipio=?', [(municipio,) for municipio in municipios])
+            return con.total_changes - antes
+
+    # Exporta os registros como DataFrame
+    def para_dataframe(self):
+        with self._conectar() as con:
+            return pd.read_sql_query(f'SELECT {self._nomes} FROM registros ORDER BY rowid', con)
@@ -0,0 +1,30 @@
+import numpy as np
+
+# Colunas com os canais RGBA usados pelo pydeck (get_fill_color='[cor_r, cor_g, cor_b, cor_a]')
+COLUNAS_COR = ['cor_r', 'cor_g', 'cor_b', 'cor_a']
+
+
+# Função para calcular o índice de risco de dengue de forma vetorizada (soma ponderada das colunas)
+def calcular_risco(df, pesos):
+    risco = np.zeros(len(df), dtype='float64')
+    for coluna, peso in pesos.items():
+        risco += df[coluna].to_numpy(dtype='float64', na_value=0.0) * peso
+    return risco
+
+
+# Função para definir as cores (RGBA) de todos os riscos de uma vez, em um buffer uint8 N x 4
+# As faixas são avaliadas na ordem do cfg.json: vale a primeira cujo limite for ultrapassado.
+def cores_risco(risco, faixas, cor_padrao):
+    condicoes = [risco > faixa['acima_de'] for faixa in faixas]
+    indice = np.select(condicoes, np.arange(len(faixas)), default=len(faixas))
+    paleta = np.array([faixa['cor'] for faixa in faixas] + [cor_padrao], dtype=np.uint8)
+    return paleta[indice]
+
+
+# Função para adicionar as colunas de risco e cor ao DataFrame (calculadas uma vez por carga)
+def aplicar_risco(df, cfg_risco):
+    df['risco_dengue'] = calcular_risco(df, cfg_risco['pesos'])
+    cores = cores_risco(df['risco_dengue'].to_numpy(), cfg_risco['faixas'], cfg_risco['cor_padrao'])
+    for i, coluna in enumerate(COLUNAS_COR):
+        df[coluna] = cores[:, i]
+    return df
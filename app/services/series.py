@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+
+# Função para converter o eixo x (datas ou números) em float64, como o LTTB precisa
+def _eixo_numerico(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype('int64').astype('float64')
+    return x.astype('float64')
+
+
+# Largest-Triangle-Three-Buckets: escolhe `n_saida` pontos que preservam a forma da série
+# Devolve os índices escolhidos (sempre inclui o primeiro e o último ponto). x deve estar ordenado.
+def lttb(x, y, n_saida):
+    n = len(x)
+    if n_saida >= n or n_saida < 3:
+        return np.arange(n)
+    x = _eixo_numerico(x)
+    y = np.asarray(y, dtype='float64')
+
+    indices = np.empty(n_saida, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    limites = np.linspace(1, n - 1, n_saida - 1).astype(np.int64)
+    anterior = 0
+    for i in range(n_saida - 2):
+        inicio, fim = limites[i], limites[i + 1]
+        proximo_fim = limites[i + 2] if i + 2 < len(limites) else n
+        media_x = x[fim:proximo_fim].mean()
+        media_y = y[fim:proximo_fim].mean()
+        area = np.abs((x[anterior] - media_x) * (y[inicio:fim] - y[anterior])
+                      - (x[anterior] - x[inicio:fim]) * (media_y - y[anterior]))
+        anterior = inicio + int(np.argmax(area))
+        indices[i + 1] = anterior
+    return indices
+
+
+# Função para reduzir uma série (x, y) a no máximo `n_saida` pontos; valores ausentes de y são ignorados
+def reduzir_xy(x, y, n_saida):
+    x = np.asarray(x)
+    y = np.asarray(y, dtype='float64')
+    validos = ~np.isnan(y)
+    x, y = x[validos], y[validos]
+    ordem = np.argsort(x, kind='stable')
+    x, y = x[ordem], y[ordem]
+    indices = lttb(x, y, n_saida)
+    return x[indices], y[indices]
+
+
+# Função para reduzir várias séries de um DataFrame (uma por grupo, por exemplo por município)
+# Cada série mantém até `n_saida` pontos, o suficiente para a largura do gráfico em pixels.
+def reduzir_por_grupo(df, x, y, grupo, n_saida):
+    partes = []
+    for nome, serie in df[[grupo, x, y]].dropna(subset=[y]).groupby(grupo, observed=True, sort=False):
+        serie = serie.sort_values(x)
+        partes.append(serie.iloc[lttb(serie[x].to_numpy(), serie[y].to_numpy(), n_saida)])
+    if not partes:
+        return df[[grupo, x, y]].iloc[0:0]
+    return pd.concat(partes, ignore_index=True)
@@ -1,102 +1,34 @@
 import pandas as pd
-import os
 import streamlit as st
 import pydeck as pdk
 import plotly.express as px
 import plotly.graph_objects as go
-import matplotlib.pyplot as plt
-import requests
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.firefox.service import Service
-from selenium.webdriver.firefox.options import Options
-from selenium.webdriver.common.by import By
-import time
-import json
-from fastapi import FastAPI
-from pydantic import BaseModel
-from datetime import datetime
-
-app = FastAPI()
-
-
-# Dataset inicial
-df = pd.DataFrame({
-    'municipio': ['Municipio1', 'Municipio2'],
-    'casos_est': [110, 160],
-    'casos_est_min': [100, 150],
-    'casos_est_max': [120, 170],
-    'casos': [100, 150],
-    'proba_disse>1': [0.2, 0.5],
-    'incidência_100khab': [50, 75],
-    'disseminação': [0.9, 1.0],
-    'população': [10000, 15000],
-    'tempmin': [20.0, 22.0],
-    'umidmax': [80, 85],
-    'umidmed': [70, 75],
-    'umidmin': [60, 65],
-    'tempmed': [25.0, 26.0],
-    'tempmax': [30.0, 32.0],
-    'estado': ['Estado1', 'Estado2'],
-    'longitude': [-51.9253, -49.9253],
-    'latitude': [-14.2350, -12.2350],
-    'data_week': ['2024-01-01', '2024-02-01']
-})
-
-
-# Modelo Pydantic para validação de entrada
-# Modelo para incluir todas as colunas
-class Item(BaseModel):
-    municipio: str
-    casos_est: int
-    casos_est_min: int
-    casos_est_max: int
-    casos: int
-    proba_disse: float
-    incidência_100khab: float
-    disseminação: float
-    população: int
-    tempmin: float
-    umidmax: int
-    umidmed: int
-    umidmin: int
-    tempmed: float
-    tempmax: float
-    estado: str
-    longitude: float
-    latitude: float
-    data_week: str
-
-# Read (leitura de um município específico)
-@app.get('/items/{municipio}')
-def read_item(municipio: str):
-    global df
-    result = df[df['municipio'] == municipio]
-    if not result.empty:
-        return result.to_dict(orient='records')[0]
-    return {"error": "Item não encontrado"}
-
-# Create (criação de novos registros)
-@app.post('/items')
-def create_item(item: Item):
-    global df
-    new_row = pd.DataFrame([item.dict()])
-    df = pd.concat([df, new_row], ignore_index=True)
-    return df.to_dict(orient='records')
-
-# Delete (remoção de registros)
-@app.delete('/items/{municipio}')
-def delete_item(municipio: str):
-    global df
-    df = df[df['municipio'] != municipio]
-    return df.to_dict(orient='records')
-
-# Update (atualização de registros)
-@app.put('/items/{municipio}')
-def update_item(municipio: str, new_item: Item):
-    global df
-    df.loc[df['municipio'] == municipio, df.columns] = new_item.dict().values()
-    return df[df['municipio'] == municipio].to_dict(orient='records')[0]
+import logging
+from config.dependences import carregar_config, carregar_schema
+from services.armazenamento import parquet_disponivel, ler_dataset, anos_disponiveis
+from services.risco import aplicar_risco
+from services.agregados import fatiar_cubo
+from services.datastore import DataStore
+from services.atualizacao import versao_atual, lotes_desde, ler_lotes
+from services.cliente_api import ClienteAPI
+from services.cache_noticias import CacheNoticias
+from services.ingestao import ler_resumo, ler_em_blocos
+from services.mapa import preparar_mapa
+from services.series import reduzir_xy, reduzir_por_grupo
+from services.exportacao import FORMATOS, chave_exportacao, exportar
+from services.consultas import MotorConsultas
+from services.metricas import Medidor
+
+# A API fica em app/api.py; o painel só a acessa pelo ClienteAPI
+
+# Os DataFrames em cache (st.cache_resource) são um único objeto por processo, compartilhado por todas
+# as sessões. Com copy-on-write, recortes não copiam os dados e qualquer alteração em um recorte gera
+# uma cópia própria, sem modificar o DataFrame compartilhado.
+pd.options.mode.copy_on_write = True
+
+# Logs estruturados (os spans são registrados como JSON de uma linha)
+cfg_metricas = carregar_config()['metricas']
+logging.basicConfig(level=cfg_metricas['nivel_log'], format='%(asctime)s %(name)s %(levelname)s %(message)s')
 
 # Configuração da página
 st.set_page_config(page_title='Monitoramento de Doenças no Brasil', page_icon='🦟', layout='wide')
@@ -257,168 +189,206 @@ if diase == 'Gripes':
 
 
 if diase == 'Dengues':
-    
-    # Funções para interagir com FastAPI
-    def get_item(municipio):
-        response = requests.get(f"http://127.0.0.1:8000/items/{municipio}")
-        return response.json()
-
-    def create_item(item):
-        response = requests.post("http://127.0.0.1:8000/items", json=item)
-        return response.json()
-
-    def update_item(municipio, item):
-        response = requests.put(f"http://127.0.0.1:8000/items/{municipio}", json=item)
-        return response.json()
 
-    def delete_item(municipio):
-        response = requests.delete(f"http://127.0.0.1:8000/items/{municipio}")
-        return response.json()
+    # Tempos das etapas desta execução do script (logs e barra lateral de depuração)
+    medidor = Medidor()
+    
+    # Cliente para interagir com FastAPI (um pool de conexões compartilhado por todas as sessões)
+    @st.cache_resource
+    def cliente_api():
+        return ClienteAPI.da_config(carregar_config()['api'])
 
         
-    # Função para carregar o dataset com cache
-    @st.cache_data
-    def carregar_dataset():
+    # Colunas usadas pela aba "Análise por Município" (mapa, risco e gráficos)
+    COLUNAS_MUNICIPIO = ('municipio', 'estado', 'data_week', 'casos_est', 'casos', 'incidência_100khab',
+                         'disseminação', 'tempmin', 'tempmed', 'tempmax', 'umidmin', 'umidmed', 'umidmax',
+                         'latitude', 'longitude')
+
+    # Função para carregar o dataset com cache (Parquet particionado quando existir, senão o CSV original)
+    # O resultado é compartilhado (somente leitura) entre as sessões, sem uma cópia por execução.
+    @st.cache_resource
+    def carregar_dataset(colunas=None, estados=None, anos=None):
         try:
-            df = pd.read_csv('data_sus/df_dengue_2023_2024.csv')
+            df = ler_dataset(carregar_config()['dados'], carregar_schema(), colunas=colunas, estados=estados, anos=anos)
         except FileNotFoundError:
             st.error("Arquivo não encontrado.")
             df = pd.DataFrame()  # Retorna um DataFrame vazio em caso de erro
         return df
 
-    # Função para definir a cor com base no índice de risco
-    def definir_cor(risco):
-        if risco > 7:
-            return [255, 0, 0, 160]  # Vermelho (risco alto)
-        elif 1 < risco <= 6.99:
-            return [255, 255, 0, 160]  # Amarelo (risco moderado)
-        else:
-            return [0, 255, 0, 160]  # Verde (risco baixo)
+    # Função para carregar a relação município -> estado (usada nos seletores)
+    @st.cache_resource
+    def carregar_municipios():
+        return carregar_dataset(colunas=('municipio', 'estado')).drop_duplicates().reset_index(drop=True)
+
+    # Função para definir os anos que cobrem a janela de até um ano antes da última semana do estado
+    def anos_janela(estado):
+        diretorio = carregar_config()['dados']['parquet_dengue']
+        if not parquet_disponivel(diretorio):
+            return None
+        anos = anos_disponiveis(diretorio, estado)
+        return tuple(anos[-2:]) if anos else None
+
+    # Função para carregar os dados de um estado já com datas convertidas, risco e cores calculados
+    # (lê apenas os anos da janela, quando houver partições)
+    def carregar_estado(estado):
+        df_estado = ler_dataset(carregar_config()['dados'], carregar_schema(), colunas=COLUNAS_MUNICIPIO,
+                                estados=(estado,), anos=anos_janela(estado))
+        df_estado['data_week'] = pd.to_datetime(df_estado['data_week'], errors='coerce')
+        return aplicar_risco(df_estado, carregar_config()['risco'])
+
+    # DataStore da aba 1, criado uma vez por processo: cada estado é carregado, ordenado por semana
+    # e tem o cubo de mínimos e máximos calculado na primeira vez em que é escolhido
+    @st.cache_resource
+    def carregar_store():
+        return DataStore(carregar_municipios(), carregar_estado, versao_atual(carregar_config()['dados']['parquet_dengue']))
+
+    # Função para aplicar ao DataStore as semanas gravadas pela atualização incremental
+    # (python -m services.atualizacao): só as linhas dos lotes novos são lidas, e as partições e os
+    # cubos já carregados são atualizados no lugar
+    def sincronizar_store(store):
+        diretorio = carregar_config()['dados']['parquet_dengue']
+        lotes = lotes_desde(diretorio, store.versao)
+        if not lotes:
+            return
+        with medidor.span('atualizacao_incremental', lotes=len(lotes)):
+            df_novo = ler_lotes(diretorio, lotes, carregar_schema(), COLUNAS_MUNICIPIO)
+            store.anexar(aplicar_risco(df_novo, carregar_config()['risco']), lotes[-1]['versao'])
+        # As faixas dos gráficos em cache foram calculadas com as semanas anteriores
+        modelo_grafico.clear()
+
+    # Agregação de cada coluna do mapa no período (um ponto por município; risco e cor da semana mais recente)
+    AGREGACOES_MAPA = {'latitude': 'first', 'longitude': 'first', 'casos': 'sum', 'casos_est': 'sum',
+                       'disseminação': 'mean', 'tempmed': 'mean', 'umidmed': 'mean', 'risco_dengue': 'last',
+                       'cor_r': 'last', 'cor_g': 'last', 'cor_b': 'last', 'cor_a': 'last'}
+
+    AGREGACOES_UPLOAD = {'latitude': 'first', 'longitude': 'first', 'casos': 'sum', 'casos_est': 'sum',
+                         'tempmed': 'mean', 'umidmed': 'mean'}
+
+    # Função para montar o mapa de células de grade (usado quando há pontos demais para exibir)
+    def deck_grade(dados, view_state):
+        layer = pdk.Layer(
+            'GridCellLayer',
+            data=dados,
+            get_position='[longitude, latitude]',
+            cell_size=carregar_config()['mapa']['tamanho_celula_graus'] * 111_000,
+            get_elevation='casos',
+            elevation_scale=100_000 / max(float(dados['casos'].max()), 1.0),
+            get_fill_color='[255, 0, 0, 160]',
+            extruded=True,
+            pickable=True,
+        )
+        return pdk.Deck(layers=[layer], initial_view_state=view_state,
+                        tooltip={'text': 'Municípios: {municipios} Casos: {casos} Estimativa: {casos_est}'})
 
     # Função para plotar o mapa interativo
     def plotar_mapa(df):
+        with medidor.span('mapa_agregacao', linhas=len(df)):
+            modo, dados = preparar_mapa(df, AGREGACOES_MAPA, carregar_config()['mapa'])
+        view_state = pdk.ViewState(
+            latitude=dados['latitude'].mean(),
+            longitude=dados['longitude'].mean(),
+            zoom=6
+        )
+        if modo == 'grade':
+            with medidor.span('mapa_pydeck', modo=modo, pontos=len(dados)):
+                st.pydeck_chart(deck_grade(dados, view_state))
+            return
         layer = pdk.Layer(
             'ScatterplotLayer',
-            data=df,
+            data=dados,
             get_position='[longitude, latitude]',
             get_radius='3000',
-            get_fill_color='cor',
+            get_fill_color='[cor_r, cor_g, cor_b, cor_a]',
             pickable=True,
             auto_highlight=True,
         )
-        view_state = pdk.ViewState(
-            latitude=df['latitude'].mean(),
-            longitude=df['longitude'].mean(),
-            zoom=6
-        )
         r = pdk.Deck(layers=[layer], initial_view_state=view_state, tooltip={
             'html': '<b>Município:</b> {municipio}<br><b>Casos:</b> {casos}<br><b>Est. Casos:</b> {casos_est}<br><b>Disseminação:</b> {disseminação}<br><b>Temperatura:</b> {tempmed}°C<br><b>Umidade:</b> {umidmed}%',
             'style': {'color': 'white'}
         })
-        st.pydeck_chart(r)
-
-    # Função para plotar gráficos interativos
-    def plotar_graficos(df_municipio, df_min_max, municipio_usuario, estado_usuario):
+        with medidor.span('mapa_pydeck', modo=modo, pontos=len(dados)):
+            st.pydeck_chart(r)
+
+    # Função para criar uma linha de gráfico reduzida (LTTB) à largura do gráfico em pixels
+    # (reduzida, uma única série nunca chega ao limiar do WebGL; só os gráficos com vários municípios o usam)
+    def linha(x, y, **kwargs):
+        cfg_graficos = carregar_config()['graficos']
+        x, y = reduzir_xy(x, y, cfg_graficos['largura_px'])
+        return go.Scatter(x=x, y=y, **kwargs)
+
+    # Função para criar um gráfico de linhas por município, reduzido e em WebGL quando há muitos pontos
+    def grafico_linhas(dados, y, titulo):
+        cfg_graficos = carregar_config()['graficos']
+        reduzidos = reduzir_por_grupo(dados, 'data_week', y, 'municipio', cfg_graficos['largura_px'])
+        render_mode = 'webgl' if len(reduzidos) > cfg_graficos['limiar_webgl'] else 'svg'
+        return px.line(reduzidos, x='data_week', y=y, color='municipio', title=titulo, render_mode=render_mode)
+
+    # Gráficos da aba 1: coluna do município e faixa de mínimo e máximo do estado (colunas do cubo)
+    GRAFICOS_MUNICIPIO = {
+        'casos': {'titulo': 'Comparação de Incidência de Casos {estado}', 'eixo_y': 'Número de Casos',
+                  'nome': 'Casos', 'minimo': ('casos', 'min'), 'nome_minimo': 'Casos Mínimos (Estado)',
+                  'maximo': ('casos', 'max'), 'nome_maximo': 'Casos Máximos (Estado)'},
+        'tempmed': {'titulo': 'Comparação de Temperatura Média no Estado {estado}', 'eixo_y': 'Temperatura Média (°C)',
+                    'nome': 'Temperatura Média', 'minimo': ('tempmin', 'min'), 'nome_minimo': 'Temperatura Mínima (Estado)',
+                    'maximo': ('tempmax', 'max'), 'nome_maximo': 'Temperatura Máxima (Estado)'},
+        'umidmed': {'titulo': 'Comparação de Umidade Média no Estado {estado}', 'eixo_y': 'Umidade Média (%)',
+                    'nome': 'Umidade Média', 'minimo': ('umidmin', 'min'), 'nome_minimo': 'Umidade Mínima (Estado)',
+                    'maximo': ('umidmax', 'max'), 'nome_maximo': 'Umidade Máxima (Estado)'},
+        'disseminação': {'titulo': 'Comparação de Disseminação no Estado {estado}', 'eixo_y': 'Disseminação',
+                         'nome': 'Disseminação', 'minimo': ('disseminação', 'min'), 'nome_minimo': 'Disseminação Mínima (Estado)',
+                         'maximo': ('disseminação', 'max'), 'nome_maximo': 'Disseminação Máxima (Estado)'},
+    }
+
+    # Função para montar o modelo de um gráfico: faixa do estado no período e layout, já serializados
+    # As faixas são iguais para todos os municípios do estado, então o modelo fica em cache por
+    # (estado, período, métrica); os menos usados são descartados (max_entries).
+    @st.cache_resource(max_entries=128)
+    def modelo_grafico(estado, data_inicial, data_maxima, metrica):
+        grafico = GRAFICOS_MUNICIPIO[metrica]
+        df_min_max = fatiar_cubo(carregar_store().cubo(estado), estado, data_inicial, data_maxima)
         fig = go.Figure()
-        # Adiciona a linha do município selecionado
-        fig.add_trace(go.Scatter(x=df_municipio['data_week'], y=df_municipio['casos'],
-                                mode='lines+markers', name=f'{municipio_usuario} - Casos', line=dict(color='red', width=4)))
-        # Linha dos casos mínimos do estado
-        fig.add_trace(go.Scatter(x=df_min_max['data_week'], y=df_min_max[('casos', 'min')],
-                                mode='lines', name='Casos Mínimos (Estado)', line=dict(color='green', dash='dash')))
-        # Linha dos casos máximos do estado
-        fig.add_trace(go.Scatter(x=df_min_max['data_week'], y=df_min_max[('casos', 'max')],
-                                mode='lines', name='Casos Máximos (Estado)', line=dict(color='blue', dash='dash')))
-        # Configurações do layout
-        fig.update_layout(title=f'Comparação de Incidência de Casos {estado_usuario}', xaxis_title='Semana',
-                        yaxis_title='Número de Casos', legend_title='Municípios')
-        st.plotly_chart(fig)
-
-
-        # Gráfico de linha para Temperatura Média (tempmed)
-        fig_tempmed = go.Figure()
-
-        # Adicionar a linha do município selecionado
-        fig_tempmed.add_trace(go.Scatter(x=df_municipio_selecionado['data_week'], y=df_municipio_selecionado['tempmed'],
-                                        mode='lines+markers', name=f'{municipio_usuario} - Temperatura Média', line=dict(color='red', width=4)))
-
-        # Adicionar a linha da temperatura mínima do estado
-        fig_tempmed.add_trace(go.Scatter(x=df_min_max['data_week'], y=df_min_max[('tempmin', 'min')],
-                                        mode='lines', name='Temperatura Mínima (Estado)', line=dict(color='green', dash='dash')))
-
-        # Adicionar a linha da temperatura máxima do estado
-        fig_tempmed.add_trace(go.Scatter(x=df_min_max['data_week'], y=df_min_max[('tempmax', 'max')],
-                                        mode='lines', name='Temperatura Máxima (Estado)', line=dict(color='blue', dash='dash')))
-
-        # Adicionar título e rótulos
-        fig_tempmed.update_layout(title=f'Comparação de Temperatura Média no Estado {estado_usuario}',
-                                xaxis_title='Semana',
-                                yaxis_title='Temperatura Média (°C)',
-                                legend_title='Municípios')
-
-        st.plotly_chart(fig_tempmed)
-
-
-        # Gráfico de linha para Umidade Média (umidmed)
-        fig_umidmed = go.Figure()
-
-        # Adicionar a linha do município selecionado
-        fig_umidmed.add_trace(go.Scatter(x=df_municipio_selecionado['data_week'], y=df_municipio_selecionado['umidmed'],
-                                        mode='lines+markers', name=f'{municipio_usuario} - Umidade Média', line=dict(color='red', width=4)))
-
-        # Adicionar a linha da umidade mínima do estado
-        fig_umidmed.add_trace(go.Scatter(x=df_min_max['data_week'], y=df_min_max[('umidmin', 'min')],
-                                        mode='lines', name='Umidade Mínima (Estado)', line=dict(color='green', dash='dash')))
-
-        # Adicionar a linha da umidade máxima do estado
-        fig_umidmed.add_trace(go.Scatter(x=df_min_max['data_week'], y=df_min_max[('umidmax', 'max')],
-                                        mode='lines', name='Umidade Máxima (Estado)', line=dict(color='blue', dash='dash')))
-
-        # Adicionar título e rótulos
-        fig_umidmed.update_layout(title=f'Comparação de Umidade Média no Estado {estado_usuario}',
-                                xaxis_title='Semana',
-                                yaxis_title='Umidade Média (%)',
-                                legend_title='Municípios')
-
-        st.plotly_chart(fig_umidmed)
-
-
-        # Gráfico de linha para Disseminação (disseminação)
-        fig_disseminacao = go.Figure()
-
-        # Adicionar a linha do município selecionado
-        fig_disseminacao.add_trace(go.Scatter(x=df_municipio_selecionado['data_week'], y=df_municipio_selecionado['disseminação'],
-                                            mode='lines+markers', name=f'{municipio_usuario} - Disseminação', line=dict(color='red', width=4)))
-
-        # Adicionar a linha da disseminação mínima do estado
-        fig_disseminacao.add_trace(go.Scatter(x=df_min_max['data_week'], y=df_min_max[('disseminação', 'min')],
-                                            mode='lines', name='Disseminação Mínima (Estado)', line=dict(color='green', dash='dash')))
-
-        # Adicionar a linha da disseminação máxima do estado
-        fig_disseminacao.add_trace(go.Scatter(x=df_min_max['data_week'], y=df_min_max[('disseminação', 'max')],
-                                            mode='lines', name='Disseminação Máxima (Estado)', line=dict(color='blue', dash='dash')))
-
-        # Adicionar título e rótulos
-        fig_disseminacao.update_layout(title=f'Comparação de Disseminação no Estado {estado_usuario}',
-                                    xaxis_title='Semana',
-                                    yaxis_title='Disseminação',
-                                    legend_title='Municípios')
-
-        st.plotly_chart(fig_disseminacao)
-
-
-
-    # Configurações para o Selenium com Firefox
-    def setup_selenium():
-        options = Options()
-        options.headless = True 
-        driver = webdriver.Firefox(options=options)
-        return driver
-
-    # Função para filtrar notícias relacionadas à dengue
-    def is_dengue_related(title, description):
-        keywords = ['dengue', 'zika', 'chikungunya', 'mosquito']
-        return any(keyword.lower() in title.lower() or keyword.lower() in description.lower() for keyword in keywords)
+        fig.add_trace(linha(x=df_min_max['data_week'], y=df_min_max[grafico['minimo']],
+                            mode='lines', name=grafico['nome_minimo'], line=dict(color='green', dash='dash')))
+        fig.add_trace(linha(x=df_min_max['data_week'], y=df_min_max[grafico['maximo']],
+                            mode='lines', name=grafico['nome_maximo'], line=dict(color='blue', dash='dash')))
+        fig.update_layout(title=grafico['titulo'].format(estado=estado), xaxis_title='Semana',
+                          yaxis_title=grafico['eixo_y'], legend_title='Municípios')
+        return fig.to_dict()
+
+    # Função para plotar gráficos interativos (só a linha do município é montada a cada execução)
+    def plotar_graficos(df_municipio, municipio_usuario, estado_usuario, data_inicial, data_maxima):
+        for metrica, grafico in GRAFICOS_MUNICIPIO.items():
+            modelo = modelo_grafico(estado_usuario, data_inicial, data_maxima, metrica)
+            linha_municipio = linha(x=df_municipio['data_week'], y=df_municipio[metrica], mode='lines+markers',
+                                    name=f"{municipio_usuario} - {grafico['nome']}", line=dict(color='red', width=4))
+            st.plotly_chart(go.Figure(data=[linha_municipio, *modelo['data']], layout=modelo['layout']))
+
+
+    # Motor de consultas (DuckDB) sobre a base nacional, compartilhado por todas as sessões
+    # (None quando não há nem o dataset Parquet nem os CSVs das regiões)
+    @st.cache_resource
+    def carregar_motor():
+        return MotorConsultas.da_config(carregar_config()['dados'], carregar_config()['consultas'])
+
+    # Função para oferecer o download dos dados filtrados: o arquivo só é gerado quando pedido
+    # `gerar(chave, formato)` devolve os bytes do arquivo (em cache pela chave dos filtros)
+    def oferecer_download(id_dados, estados, municipios, gerar):
+        formato = st.radio('Formato do arquivo', list(FORMATOS), horizontal=True)
+        chave = chave_exportacao(id_dados, estados, municipios, formato)
+        if st.button('Preparar download'):
+            st.session_state['exportacao'] = chave
+
+        if st.session_state.get('exportacao') == chave:
+            extensao, mime = FORMATOS[formato]
+            with medidor.span('exportacao', formato=formato):
+                dados_exportados = gerar(chave, formato)
+            # Baixar arquivo
+            st.download_button(
+                label='Baixar dados filtrados',
+                data=dados_exportados,
+                file_name=f'dados_filtrados.{extensao}',
+                mime=mime,
+            )
 
     # Função para organizar visualização das notícias
     def show_news_column(news_data, column_title):
@@ -429,69 +399,32 @@ if diase == 'Dengues':
                 st.write(news['description'])
 
 
-    # Função para fazer scraping da página
-    def scrape_dengue_info():
-        driver = setup_selenium()
-        url = 'https://www.gov.br/saude/pt-br/assuntos/saude-de-a-a-z/d/dengue'
-        
-        # Acessar a página
-        driver.get(url)
-        
-        # Esperar que a página carregue completamente
-        time.sleep(5)  # Ajuste esse tempo de espera conforme necessário
-
-        # Encontrar todos os parágrafos com informações
-        paragraphs = driver.find_elements(By.TAG_NAME, 'p')
-        
-        # Extrair o texto e armazenar em uma lista
-        dengue_info = [p.text for p in paragraphs]
-        
-        # Fechar o driver
-        driver.quit()
-        
-        # Retornar as informações coletadas
-        return dengue_info
-
-    # Função para fazer scraping da CNN (notícias gerais)
-    def scrape_cnn_news():
-        driver = setup_selenium()
-        url = 'https://www.cnnbrasil.com.br/tudo-sobre/dengue/'
-        driver.get(url)
-        time.sleep(5)  # Ajuste esse tempo de espera conforme necessário
-        
-        news_elements = driver.find_elements(By.CLASS_NAME, 'home__list__item')
-        news_data = []
-        for element in news_elements:
-            title = element.find_element(By.TAG_NAME, 'h3').text
-            link = element.find_element(By.TAG_NAME, 'a').get_attribute('href')
-            date = element.find_element(By.CLASS_NAME, 'home__title__date').text
-            description = element.find_element(By.TAG_NAME, 'a').get_attribute('title')
-            if is_dengue_related(title, description):
-                news_data.append({'title': title, 'link': link, 'date': date, 'description': description})
-        
-        driver.quit()
-        return news_data
-
-    # Função para fazer scraping das notícias do estado e município (G1)
-    def scrape_g1_news(state, city=None):
-        driver = setup_selenium()
-        search_query = f"dengue {state}" + (f" {city}" if city else "")
-        url = f"https://g1.globo.com/busca/?q={search_query}"
-        driver.get(url)
-        time.sleep(5)
-        
-        news_elements = driver.find_elements(By.CLASS_NAME, 'widget--info')
-        news_data = []
-        for element in news_elements:
-            title = element.find_element(By.CLASS_NAME, 'widget--info__title').text
-            link = element.find_element(By.TAG_NAME, 'a').get_attribute('href')
-            description = element.find_element(By.CLASS_NAME, 'widget--info__description').text
-            date = element.find_element(By.CLASS_NAME, 'widget--info__meta').text
-            if is_dengue_related(title, description):
-                news_data.append({'title': title, 'link': link, 'date': date, 'description': description})
-        
-        driver.quit()
-        return news_data
+    # Cache em disco das notícias e informações, compartilhado por todas as sessões
+    @st.cache_resource
+    def cache_noticias():
+        cfg_cache = carregar_config()['noticias']['cache']
+        return CacheNoticias(cfg_cache['caminho'], cfg_cache['ttl_segundos'],
+                             max_stale_segundos=cfg_cache['max_stale_segundos'],
+                             tamanho_maximo_mb=cfg_cache['tamanho_maximo_mb'])
+
+    # Funções que consultam o cache antes de fazer o scraping
+    # (os scrapers, com requests, BeautifulSoup e Selenium, só são importados quando usados)
+    def obter_dengue_info():
+        from services.noticias import scrape_dengue_info
+        timeout = carregar_config()['noticias']['timeout']
+        return cache_noticias().obter('dengue_info', None, None, lambda: scrape_dengue_info(timeout=timeout))
+
+    def obter_cnn_news():
+        from services.noticias import scrape_cnn_news
+        timeout = carregar_config()['noticias']['timeout']
+        return cache_noticias().obter('cnn', None, None, lambda: scrape_cnn_news(timeout=timeout))
+
+    # (o cache pode ser passado já resolvido, para chamadas feitas fora da thread do Streamlit)
+    def obter_g1_news(state, city=None, cache=None):
+        from services.noticias import scrape_g1_news
+        timeout = carregar_config()['noticias']['timeout']
+        cache = cache or cache_noticias()
+        return cache.obter('g1', state, city, lambda: scrape_g1_news(state, city, timeout=timeout))
 
     # Função para exibir as notícias no Streamlit
     def display_news(news, title):
@@ -501,8 +434,9 @@ if diase == 'Dengues':
             st.write(f"[Link]({item['link']})")
             st.write(f"*Publicado em: {item['date']}*")
             st.write("---")
-    # Carregar o dataset
-    df = carregar_dataset()
+    # Carregar a relação de municípios (os dados completos são lidos por estado na aba 1)
+    with medidor.span('carregar_municipios'):
+        df = carregar_municipios()
 
     # Se o dataset foi carregado corretamente
     if not df.empty:
@@ -513,42 +447,29 @@ if diase == 'Dengues':
         with abas[0]:
             st.title("🦟Análise da Situação do Município - Dengue🦟")
             
-            # Conversão e tratamento dos dados
-            df['data_week'] = pd.to_datetime(df['data_week'], errors='coerce')
-            municipio_usuario = st.selectbox("Selecione seu município", sorted(df['municipio'].unique()))
-            estado_usuario = df[df['municipio'] == municipio_usuario]['estado'].values[0]
-            df_estado = df[df['estado'] == estado_usuario]
-            data_maxima = df_estado['data_week'].max()
+            store = carregar_store()
+            sincronizar_store(store)
+            municipio_usuario = st.selectbox("Selecione seu município", store.municipios())
+            estado_usuario = store.estado_de(municipio_usuario)
+
+            # Carregar apenas o estado selecionado, com o risco e as cores do mapa já calculados
+            with medidor.span('carregar_estado', estado=estado_usuario):
+                data_maxima = pd.Timestamp(store.data_maxima(estado_usuario))
             filtro_periodo = st.radio("Filtrar por", ('Último Mês', 'Último Ano'))
             
-            # Definir o período de filtragem
+            # Definir o período de filtragem (recorte da partição do estado, já ordenada por semana)
             data_inicial = data_maxima - pd.DateOffset(months=1) if filtro_periodo == 'Último Mês' else data_maxima - pd.DateOffset(years=1)
-            df_filtrado = df_estado[(df_estado['data_week'] >= data_inicial) & (df_estado['data_week'] <= data_maxima)].copy()
+            with medidor.span('filtro_periodo'):
+                df_filtrado = store.janela(estado_usuario, data_inicial, data_maxima)
 
-            
-            # Calcular risco e aplicar cor
-            df_filtrado.loc[:, 'risco_dengue'] = df_filtrado['casos_est'] * 0.1 + df_filtrado['casos'] * 0.3 + df_filtrado['incidência_100khab'] * 0.1 + df_filtrado['disseminação'] * 5
-            df_filtrado.loc[:, 'cor'] = df_filtrado['risco_dengue'].apply(definir_cor)
-            
             # Mostrar mapa interativo
             st.write("O mapa corresponde à opção de um mês.")
             plotar_mapa(df_filtrado)
             
-            # Criar e exibir gráficos
-            df_min_max = df_filtrado.groupby('data_week').agg({
-                'casos': ['min', 'max'],
-                'incidência_100khab': ['min', 'max'],
-                'disseminação': ['min', 'max'],
-                'umidmed': ['min', 'max'],
-                'umidmin': ['min', 'max'],
-                'umidmax': ['min', 'max'],
-                'tempmed': ['min', 'max'],
-                'tempmin': ['min', 'max'],
-                'tempmax': ['min', 'max']
-            }).reset_index()
-
+            # Criar e exibir gráficos (faixas do estado em cache; só a linha do município muda)
             df_municipio_selecionado = df_filtrado[df_filtrado['municipio'] == municipio_usuario]
-            plotar_graficos(df_municipio_selecionado, df_min_max, municipio_usuario, estado_usuario)
+            with medidor.span('graficos'):
+                plotar_graficos(df_municipio_selecionado, municipio_usuario, estado_usuario, data_inicial, data_maxima)
 
         # Aba 2: Informações e Sintomas
         with abas[1]:
@@ -559,7 +480,7 @@ if diase == 'Dengues':
             # Infomação
             if st.button("Informações sobre Dengue"):
                 try:
-                    informacoes = scrape_dengue_info()
+                    informacoes = obter_dengue_info()
                     
                     # Exibir as informações no Streamlit
                     for info in informacoes:
@@ -572,7 +493,7 @@ if diase == 'Dengues':
             # CNN: Notícias gerais
             if st.button("Carregar notícias gerais"):
                 try:
-                    cnn_news = scrape_cnn_news()
+                    cnn_news = obter_cnn_news()
                     if cnn_news:
                         show_news_column(cnn_news, "Notícias Gerais")
                     else:
@@ -584,15 +505,27 @@ if diase == 'Dengues':
 
             if st.button("Carregar notícias por estado e município"):
                 try:
-                    state_news = scrape_g1_news(estado_usuario)
-                    city_news = scrape_g1_news(estado_usuario, municipio_usuario) if municipio_usuario else []
+                    # Buscas do estado e do município feitas ao mesmo tempo
+                    from services.noticias import coletar_em_paralelo
+                    cache = cache_noticias()
+                    tarefas = {'estado': (obter_g1_news, (estado_usuario, None, cache))}
+                    if municipio_usuario:
+                        tarefas['municipio'] = (obter_g1_news, (estado_usuario, municipio_usuario, cache))
+                    resultados = coletar_em_paralelo(tarefas, carregar_config()['noticias']['max_workers'])
+                    # Uma busca que falhou não impede de mostrar a outra
+                    state_news = resultados['estado']
+                    city_news = resultados.get('municipio', [])
                     
-                    if state_news:
+                    if isinstance(state_news, Exception):
+                        st.error(f"Erro ao carregar notícias do estado: {state_news}")
+                    elif state_news:
                         show_news_column(state_news, f"Notícias no estado: {estado_usuario}")
                     else:
                         st.write(f"Nenhuma notícia encontrada para o estado {estado_usuario}.")
                     
-                    if city_news:
+                    if isinstance(city_news, Exception):
+                        st.error(f"Erro ao carregar notícias do município: {city_news}")
+                    elif city_news:
                         show_news_column(city_news, f"Notícias no município: {municipio_usuario}")
                     elif municipio_usuario:
                         st.write(f"Nenhuma notícia encontrada para o município {municipio_usuario}.")
@@ -611,145 +544,185 @@ if diase == 'Dengues':
 
             st.write('Here you need upload the csv with data from 2010 to 2024. \nHas customizable graphics and an interactive map. \n Google Drive Data link: https://drive.google.com/drive/folders/19OGg_d3S9L6wc99I3FZxc5Mn9Ba-jXos?usp=drive_link \n DropBox Data Link: https://www.dropbox.com/scl/fo/wuwb1zpcxuvvlnyfrkcpf/AIBXL31_YW6QpjbWKyG-v2s?rlkey=8vzsj4lddvx5sh61ce8hl2df1&st=zvb71bzb&dl=0')
 
-            uploaded_file = st.file_uploader('Faça o upload do arquivo da região desejada.')
-            if uploaded_file:
-                @st.cache_data
-                def load_data(uploaded_file):
-                    df = pd.read_csv(uploaded_file)
-                    return df
-                
-                df = load_data(uploaded_file)       
-                st.write('Dados carregados com sucesso!')
-
-                # Certifique-se de que a coluna 'estado' seja do tipo string e remova valores nulos
-                df['estado'] = df['estado'].astype(str)
-                df = df[df['estado'].notna()]
-            
-                # Multiselect para selecionar as colunas desajas
-                selected_columns = st.multiselect("Selecione as colunas. :)", df.columns.tolist(), default=df.columns.tolist())
-
-                # Multiselect para selecionar os estados, ordenados alfabeticamente
-                selected_estado = st.multiselect(" Selecione os estados.", sorted(df['estado'].astype(str).unique()))
-                df_filtrado = df[(df['estado'].isin(selected_estado))]
-
-                # Multiselect para selecionar os municípios, ordenados alfabeticamente
-                selected_municipio = st.multiselect("Selecione os municípios.", sorted(df_filtrado['municipio'].astype(str).unique()), default=sorted(df_filtrado['municipio'].astype(str).unique()))
-                df_filtrado = df_filtrado[(df_filtrado['municipio'].isin(selected_municipio))]
+            # Fonte dos dados: a base nacional (consultada com o DuckDB, sem upload) ou o arquivo de uma região
+            motor = carregar_motor()
+            fontes = ('Base nacional', 'Upload de arquivo') if motor is not None else ('Upload de arquivo',)
+            fonte = st.radio('Fonte dos dados', fontes, horizontal=True)
+
+            if fonte == 'Base nacional':
+                # Filtros aplicados no DuckDB: só as linhas pedidas chegam ao pandas
+                colunas_arquivo, estados_arquivo = motor.colunas(), motor.estados()
+                selected_columns = st.multiselect("Selecione as colunas. :)", colunas_arquivo, default=colunas_arquivo)
+                selected_estado = st.multiselect(" Selecione os estados.", estados_arquivo)
+                municipios_estados = motor.municipios(selected_estado)
+                selected_municipio = st.multiselect("Selecione os municípios.", municipios_estados, default=municipios_estados)
+                filtros = {'estados': selected_estado, 'municipios': selected_municipio}
+
+                with medidor.span('consulta_filtro'):
+                    total_registros = motor.contar(**filtros)
+                    amostra = motor.filtrar(carregar_schema(), selected_columns, limite=carregar_config()['consultas']['linhas_tabela'], **filtros)
                 st.write('Dados filtrados:')
-                st.write(len(df_filtrado), ' Registros')
-                st.dataframe(df_filtrado[selected_columns])
-
+                st.write(total_registros, ' Registros')
+                if total_registros > len(amostra):
+                    st.caption(f'Mostrando as primeiras {len(amostra)} linhas; o download inclui todas.')
+                st.dataframe(amostra)
 
-                def convert_df(df):
-                    return df.to_csv().encode('utf-8')
+                # Arquivo para download gerado pelo DuckDB direto das consultas
+                @st.cache_data(max_entries=8)
+                def exportar_consulta(chave, formato, estados, municipios):
+                    return carregar_motor().exportar(formato, estados=estados, municipios=municipios)
 
-                csv = convert_df(df_filtrado)
-                # Baixar csv
-                st.download_button(
-                    label='Baixar dados filtrados',
-                    data=csv,
-                    file_name='dados_filtrados.csv',
-                    mime='text/csv',
-                )
+                oferecer_download('base-nacional', selected_estado, selected_municipio,
+                                  lambda chave, formato: exportar_consulta(chave, formato, selected_estado, selected_municipio))
 
                 if selected_municipio:
-                    # Converter a coluna para o tipo datetime
-                    df_filtrado['data_week'] = pd.to_datetime(df_filtrado['data_week'])
-
-                    # Selecionar o intervalo de datas para visualização
-                    data_inicial = st.date_input('Data inicial', value=df_filtrado['data_week'].min(), min_value=df_filtrado['data_week'].min(), max_value=df_filtrado['data_week'].max())
-                    data_final = st.date_input('Data final', value=df_filtrado['data_week'].max(), min_value=df_filtrado['data_week'].min(), max_value=df_filtrado['data_week'].max())
-
-                    # Filtrar os dados para o intervalo de datas selecionado
-                    dados_filtrados = df_filtrado[(df_filtrado['data_week'] >= pd.to_datetime(data_inicial)) & (df_filtrado['data_week'] <= pd.to_datetime(data_final))]
+                    data_minima, data_maxima = motor.intervalo_datas(**filtros)
+                    data_inicial = st.date_input('Data inicial', value=data_minima, min_value=data_minima, max_value=data_maxima)
+                    data_final = st.date_input('Data final', value=data_maxima, min_value=data_minima, max_value=data_maxima)
 
-                    # Agrupar os dados por município e somar os casos e a estimativa de casos
-                    dados_agrupados = dados_filtrados.groupby(['municipio', 'latitude', 'longitude']).agg(
-                        casos=('casos', 'sum'),
-                        casos_est=('casos_est', 'sum'),
-                        tempmed=('tempmed', 'mean'),  # Somar as temperaturas médias
-                        umidmed=('umidmed', 'mean')   # Somar as umidades médias
-                    ).reset_index()
+                    # Linhas do período (para os gráficos) e agregação do mapa calculada no DuckDB
+                    filtros_periodo = dict(filtros, data_inicial=pd.to_datetime(data_inicial), data_final=pd.to_datetime(data_final))
+                    with medidor.span('consulta_periodo'):
+                        dados_filtrados = motor.filtrar(carregar_schema(), **filtros_periodo)
+                    with medidor.span('consulta_agregacao'):
+                        modo_mapa, dados_agrupados = motor.preparar_mapa(AGREGACOES_UPLOAD, carregar_config()['mapa'], **filtros_periodo)
 
-                    # Limitar o número de casas decimais de tempmed e umidmed
-                    dados_agrupados['tempmed'] = dados_agrupados['tempmed'].round(2)
-                    dados_agrupados['umidmed'] = dados_agrupados['umidmed'].round(2)
+            else:
+                uploaded_file = st.file_uploader('Faça o upload do arquivo da região desejada.')
+                selected_municipio = []
+                if uploaded_file:
+                    # Primeira leitura: só o cabeçalho e a coluna 'estado', em blocos
+                    @st.cache_data
+                    def load_resumo(uploaded_file):
+                        return ler_resumo(uploaded_file)
+
+                    # Segunda leitura: em blocos e com tipos explícitos, guardando só as linhas dos estados escolhidos
+                    # (compartilhada como somente leitura; só os últimos arquivos/seleções ficam em memória)
+                    @st.cache_resource(max_entries=4)
+                    def load_data(uploaded_file, estados):
+                        return ler_em_blocos(uploaded_file, estados, carregar_schema())
+
+                    with medidor.span('upload_resumo'):
+                        colunas_arquivo, estados_arquivo = load_resumo(uploaded_file)
+                    st.write('Dados carregados com sucesso!')
+
+                    # Multiselect para selecionar as colunas desajas
+                    selected_columns = st.multiselect("Selecione as colunas. :)", colunas_arquivo, default=colunas_arquivo)
+
+                    # Multiselect para selecionar os estados, ordenados alfabeticamente
+                    selected_estado = st.multiselect(" Selecione os estados.", estados_arquivo)
+                    with medidor.span('upload_leitura', estados=len(selected_estado)):
+                        df_filtrado = load_data(uploaded_file, tuple(selected_estado))
+
+                    # Multiselect para selecionar os municípios, ordenados alfabeticamente
+                    selected_municipio = st.multiselect("Selecione os municípios.", sorted(df_filtrado['municipio'].astype(str).unique()), default=sorted(df_filtrado['municipio'].astype(str).unique()))
+                    with medidor.span('upload_filtro_municipios', linhas=len(df_filtrado)):
+                        df_filtrado = df_filtrado[(df_filtrado['municipio'].isin(selected_municipio))]
+                    st.write('Dados filtrados:')
+                    st.write(len(df_filtrado), ' Registros')
+                    st.dataframe(df_filtrado[selected_columns])
+
+
+                    # Arquivo para download: gerado só quando pedido e guardado em cache pela chave dos filtros
+                    @st.cache_data(max_entries=8)
+                    def convert_df(chave, _df, formato):
+                        return exportar(_df, formato)
+
+                    oferecer_download(uploaded_file.file_id, selected_estado, selected_municipio,
+                                      lambda chave, formato: convert_df(chave, df_filtrado, formato))
+
+                    if selected_municipio:
+                        # Selecionar o intervalo de datas para visualização
+                        data_inicial = st.date_input('Data inicial', value=df_filtrado['data_week'].min(), min_value=df_filtrado['data_week'].min(), max_value=df_filtrado['data_week'].max())
+                        data_final = st.date_input('Data final', value=df_filtrado['data_week'].max(), min_value=df_filtrado['data_week'].min(), max_value=df_filtrado['data_week'].max())
+
+                        # Filtrar os dados para o intervalo de datas selecionado
+                        dados_filtrados = df_filtrado[(df_filtrado['data_week'] >= pd.to_datetime(data_inicial)) & (df_filtrado['data_week'] <= pd.to_datetime(data_final))]
+
+                        # Agrupar os dados por município (soma dos casos, média de temperatura e umidade);
+                        # com municípios demais, os pontos são agrupados em células de grade
+                        with medidor.span('upload_agregacao', linhas=len(dados_filtrados)):
+                            modo_mapa, dados_agrupados = preparar_mapa(dados_filtrados, AGREGACOES_UPLOAD, carregar_config()['mapa'])
+                else:
+                    st.write('Nenhum arquivo foi carregado.')
+
+            # Verificar se há dados após a filtragem
+            if selected_municipio:
+
+                view_state = pdk.ViewState(
+                    latitude=-15.7801,  # Posição central do Brasil
+                    longitude=-47.9292,
+                    zoom=4,
+                    pitch=50
+                )
 
-                # Verificar se há dados após a filtragem
-                if selected_municipio:
+                # Criar o mapa interativo
+                layer = pdk.Layer(
+                    'ScatterplotLayer',
+                    data=dados_agrupados,
+                    get_position='[longitude, latitude]',  # Coordenadas corretas
+                    get_radius=9000,  # Ajustar o tamanho dos pontos
+                    get_fill_color='[255, 0, 0, 160]',  # Vermelho translúcido
+                    pickable=True
+                )
 
-                    # Criar o mapa interativo
-                    layer = pdk.Layer(
-                        'ScatterplotLayer',
-                        data=dados_agrupados,
-                        get_position='[longitude, latitude]',  # Coordenadas corretas
-                        get_radius=9000,  # Ajustar o tamanho dos pontos
-                        get_fill_color='[255, 0, 0, 160]',  # Vermelho translúcido
-                        pickable=True
-                    )
-
-                    view_state = pdk.ViewState(
-                        latitude=-15.7801,  # Posição central do Brasil
-                        longitude=-47.9292,
-                        zoom=4,
-                        pitch=50
-                    )
-
-                    r = pdk.Deck(
-                        layers=[layer],
-                        initial_view_state=view_state,
-                        tooltip={"text": "{municipio} Casos: {casos} Estimativa: {casos_est} Temp: {tempmed} nUmidade: {umidmed} %"}
-                    )
+                r = pdk.Deck(
+                    layers=[layer],
+                    initial_view_state=view_state,
+                    tooltip={"text": "{municipio} Casos: {casos} Estimativa: {casos_est} Temp: {tempmed} nUmidade: {umidmed} %"}
+                ) if modo_mapa == 'pontos' else deck_grade(dados_agrupados, view_state)
 
+                with medidor.span('upload_pydeck', modo=modo_mapa, pontos=len(dados_agrupados)):
                     st.pydeck_chart(r)
 
 
+                # Gráficos de linha reduzidos à largura da tela (LTTB); um intervalo de datas menor mostra mais detalhes
+                st.caption('Para ver mais detalhes nos gráficos de linha, diminua o intervalo de datas.')
+
+                with medidor.span('upload_graficos_linhas', linhas=len(dados_filtrados)):
                     # Evolução dos casos ao longo do tempo
-                    fig = px.line(dados_filtrados, x='data_week', y='casos', color='municipio', title='Evolução dos casos ao longo do tempo')
+                    fig = grafico_linhas(dados_filtrados, 'casos', 'Evolução dos casos ao longo do tempo')
                     st.plotly_chart(fig)
 
                     # Temperatura ao longo do tempo
-                    fig = px.line(dados_filtrados, x='data_week', y='tempmed', color='municipio', title='Temperatura ao longo do tempo')
+                    fig = grafico_linhas(dados_filtrados, 'tempmed', 'Temperatura ao longo do tempo')
                     st.plotly_chart(fig)
                     
                     # Úmidade ao longo do tempo
-                    fig = px.line(dados_filtrados, x='data_week', y='umidmed', color='municipio', title='Úmidade ao longo do tempo')
+                    fig = grafico_linhas(dados_filtrados, 'umidmed', 'Úmidade ao longo do tempo')
                     st.plotly_chart(fig)
-                
-                
-                if selected_municipio:   
-                    # Seletor de colunas
-                    colunas = dados_filtrados.columns.tolist()
+            
+            
+            if selected_municipio:   
+                # Seletor de colunas
+                colunas = dados_filtrados.columns.tolist()
 
-                    # Gráfico de barras
-                    st.subheader('Gráfico de Barras')
-                    x_col_barra = st.selectbox('Para o eixo X indico selecionar data, municipios ou estados', colunas, key='x_barra')
-                    y_col_barra = st.selectbox('Para o eixo Y indico selecionar uma coluna numérica ', colunas, key='y_barra')
+                # Gráfico de barras
+                st.subheader('Gráfico de Barras')
+                x_col_barra = st.selectbox('Para o eixo X indico selecionar data, municipios ou estados', colunas, key='x_barra')
+                y_col_barra = st.selectbox('Para o eixo Y indico selecionar uma coluna numérica ', colunas, key='y_barra')
 
-                    if x_col_barra and y_col_barra:
-                        grafico_barra = px.bar(dados_filtrados, x=x_col_barra, y=y_col_barra, title=f'Gráfico de Barras: {x_col_barra} vs {y_col_barra}')
-                        st.plotly_chart(grafico_barra)
+                if x_col_barra and y_col_barra:
+                    grafico_barra = px.bar(dados_filtrados, x=x_col_barra, y=y_col_barra, title=f'Gráfico de Barras: {x_col_barra} vs {y_col_barra}')
+                    st.plotly_chart(grafico_barra)
 
 
-                    # Gráfico de pizza 
-                    st.subheader('Gráfico de Pizza')
-                    pie_col = st.selectbox('Selecione a coluna para os valores, indico selecionar uma coluna numérica', colunas, key='pie')
-                    pie_col_names = st.selectbox('Selecione a coluna para os nomes como data, municipios ou estados', colunas, key='pie_names')
+                # Gráfico de pizza 
+                st.subheader('Gráfico de Pizza')
+                pie_col = st.selectbox('Selecione a coluna para os valores, indico selecionar uma coluna numérica', colunas, key='pie')
+                pie_col_names = st.selectbox('Selecione a coluna para os nomes como data, municipios ou estados', colunas, key='pie_names')
 
-                    if pie_col and pie_col_names:
-                        grafico_pizza = px.pie(dados_filtrados, values=pie_col, names=pie_col_names, title=f'Gráfico de Pizza: {pie_col_names} - {pie_col}')
-                        st.plotly_chart(grafico_pizza)
-                        
-
-                    # Histograma
-                    st.subheader('Histograma')
-                    x_col_histo = st.selectbox('Selecione o eixo x, indico selecionar uma coluna categórica', colunas, key='x_histo')
-                    y_col_histo = st.selectbox('Selecione o eixo Y, indico selecionar uma coluna numérica', colunas, key='y_histo')
-                    grafico_histograma = px.histogram(dados_filtrados, x=x_col_histo, y=y_col_histo, nbins=200, )
-                    st.plotly_chart(grafico_histograma)
+                if pie_col and pie_col_names:
+                    grafico_pizza = px.pie(dados_filtrados, values=pie_col, names=pie_col_names, title=f'Gráfico de Pizza: {pie_col_names} - {pie_col}')
+                    st.plotly_chart(grafico_pizza)
+                    
 
-            else:
-                st.write('Nenhum arquivo foi carregado.')
+                # Histograma
+                st.subheader('Histograma')
+                x_col_histo = st.selectbox('Selecione o eixo x, indico selecionar uma coluna categórica', colunas, key='x_histo')
+                y_col_histo = st.selectbox('Selecione o eixo Y, indico selecionar uma coluna numérica', colunas, key='y_histo')
+                grafico_histograma = px.histogram(dados_filtrados, x=x_col_histo, y=y_col_histo, nbins=200, )
+                st.plotly_chart(grafico_histograma)
 
         #API
         with abas[3]:
@@ -761,7 +734,7 @@ if diase == 'Dengues':
 
             # Buscar dados do município
             if st.button("Buscar Município"):
-                item = get_item(municipio)
+                item = cliente_api().get_item(municipio)
                 st.write(item)
 
             # Adicionar novo município
@@ -809,7 +782,7 @@ if diase == 'Dengues':
                     "latitude": latitude,
                     "data_week": str(data_week)
                 }
-                response = create_item(item)
+                response = cliente_api().create_item(item)
                 st.write(response)
 
             # Atualizar município
@@ -836,10 +809,27 @@ if diase == 'Dengues':
                     "latitude": latitude,
                     "data_week": str(data_week)
                 }
-                response = update_item(municipio, item)
+                response = cliente_api().update_item(municipio, item)
                 st.write(response)
 
             # Deletar município
             if st.button("Deletar Município"):
-                response = delete_item(municipio)
+                response = cliente_api().delete_item(municipio)
                 st.write(response)
+
+            # Operações em lote (uma requisição para vários municípios)
+            st.subheader("Operações em lote")
+            municipios_lote = st.multiselect("Selecione os municípios", sorted(df['municipio'].unique()), key='municipios_lote')
+            if st.button("Buscar Municípios"):
+                st.write(cliente_api().get_items(municipios_lote))
+            if st.button("Deletar Municípios"):
+                st.write(cliente_api().delete_items(municipios_lote))
+
+            # Previsão de casos para os municípios selecionados (uma requisição para todos)
+            semana_previsao = st.date_input("Semana da previsão", key='semana_previsao')
+            if st.button("Prever Casos"):
+                st.write(cliente_api().forecast([(m, str(semana_previsao)) for m in municipios_lote]))
+
+    # Barra lateral de depuração com os tempos das etapas desta execução
+    if st.sidebar.checkbox('Mostrar tempos das etapas', value=cfg_metricas['debug_sidebar']):
+        st.sidebar.dataframe(medidor.tabela(), hide_index=True)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Os módulos do projeto são importados a partir da pasta app (como no streamlit run e no uvicorn)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app'))
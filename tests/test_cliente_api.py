@@ -0,0 +1,44 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from services.cliente_api import ClienteAPI
+
+
+# Servidor que devolve o método e o caminho recebidos, exatamente como chegaram na requisição
+class Eco(BaseHTTPRequestHandler):
+
+    def responder(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        corpo = json.dumps({'metodo': self.command, 'caminho': self.path}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    do_GET = do_PUT = do_DELETE = responder
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def cliente():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Eco)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield ClienteAPI(f'http://127.0.0.1:{httpd.server_address[1]}', tentativas=0)
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.mark.parametrize('municipio, caminho', [
+    ('São João de Meriti', '/items/S%C3%A3o%20Jo%C3%A3o%20de%20Meriti'),
+    ('A/B', '/items/A%2FB'),
+    ('x?y#z%', '/items/x%3Fy%23z%25'),
+])
+def test_municipio_codificado_no_caminho(cliente, municipio, caminho):
+    assert cliente.get_item(municipio) == {'metodo': 'GET', 'caminho': caminho}
+    assert cliente.update_item(municipio, {}) == {'metodo': 'PUT', 'caminho': caminho}
+    assert cliente.delete_item(municipio) == {'metodo': 'DELETE', 'caminho': caminho}
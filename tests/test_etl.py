@@ -0,0 +1,32 @@
+import pandas as pd
+from services import LINHAS_REMOVIDAS, processar_arquivo
+
+
+# Arquivo bruto do infodengue: uma linha por variável e uma coluna por semana
+def arquivo_bruto(caminho):
+    variaveis = {0: 'data_iniSE', 1: 'casos_est_min', 2: 'umidmax', 3: 'tempmin', 4: 'casos'}
+    semanas = {
+        'data_iniSE': ['2024-01-14', '2024-01-07', '2024-01-21'],
+        'casos_est_min': [458.6489, 12.25, 3.5],
+        'umidmax': [41.181, 300.5, 88.0],
+        'tempmin': [None, 18.5, 20.5],
+        'casos': [459, 12, 4],
+    }
+    linhas = []
+    for i in range(30):
+        nome = variaveis.get(i, f'v{i}')
+        linhas.append([nome] + semanas.get(nome, [i, i, i]))
+    pd.DataFrame(linhas, columns=['variavel', 's1', 's2', 's3']).to_csv(caminho, index=False)
+
+
+# O ETL regrava o CSV de origem: os valores precisam sair como vieram, sem arredondamento
+def test_etl_mantem_os_valores_da_fonte(tmp_path):
+    caminho = tmp_path / 'infodengue.csv'
+    arquivo_bruto(caminho)
+    processar_arquivo(str(caminho))
+    df = pd.read_csv(caminho)
+    assert list(df['data_iniSE']) == ['2024-01-07', '2024-01-14', '2024-01-21']
+    assert list(df['casos_est_min']) == [12.25, 458.6489, 3.5]
+    assert list(df['umidmax']) == [300.5, 41.181, 88.0]
+    assert list(df['tempmin']) == [18.5, 19.5, 20.5]
+    assert not any(f'v{i}' in df.columns for i in LINHAS_REMOVIDAS)
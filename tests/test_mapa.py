@@ -0,0 +1,52 @@
+import json
+import numpy as np
+import pandas as pd
+import pydeck as pdk
+from services.consultas import MotorConsultas
+from services.mapa import preparar_mapa
+
+AGREGACOES = {'latitude': 'first', 'longitude': 'first', 'casos': 'sum', 'tempmed': 'mean'}
+CFG_MAPA = {'limiar_pontos': 3000, 'tamanho_celula_graus': 0.5, 'casas_decimais': 2}
+
+
+# Linhas com as colunas float32 do esquema compacto
+def semanas():
+    return pd.DataFrame({
+        'municipio': ['M1', 'M1', 'M2'],
+        'estado': ['RJ', 'RJ', 'BA'],
+        'data_week': pd.to_datetime(['2024-01-07', '2024-01-14', '2024-01-07']),
+        'latitude': np.array([1.53, 1.53, -10.51], dtype='float32'),
+        'longitude': np.array([-43.17, -43.17, -38.123456], dtype='float32'),
+        'casos': np.array([1, 2, 3], dtype='int32'),
+        'tempmed': np.array([25.1, 26.2, 27.3], dtype='float32'),
+    })
+
+
+# Valores numéricos da camada, como o pydeck os serializa para o navegador
+def valores_da_camada(dados):
+    layer = pdk.Layer('ScatterplotLayer', data=dados, get_position='[longitude, latitude]')
+    dados_json = json.loads(pdk.Deck(layers=[layer]).to_json())['layers'][0]['data']
+    return [valor for linha in dados_json for valor in linha.values() if isinstance(valor, float)]
+
+
+def casas_decimais(valor):
+    return len(repr(valor).split('.')[1]) if '.' in repr(valor) else 0
+
+
+def test_mapa_envia_valores_arredondados():
+    modo, dados = preparar_mapa(semanas(), AGREGACOES, CFG_MAPA)
+    valores = valores_da_camada(dados)
+    assert modo == 'pontos'
+    assert 1.53 in valores and -10.51 in valores
+    assert all(casas_decimais(valor) <= CFG_MAPA['casas_decimais'] for valor in valores)
+
+
+def test_mapa_do_duckdb_envia_valores_arredondados(tmp_path):
+    caminho = str(tmp_path / 'dengue.parquet')
+    semanas().to_parquet(caminho)
+    motor = MotorConsultas(f"read_parquet('{caminho}')")
+    modo, dados = motor.preparar_mapa(AGREGACOES, CFG_MAPA)
+    valores = valores_da_camada(dados)
+    assert modo == 'pontos'
+    assert 1.53 in valores and -10.51 in valores
+    assert all(casas_decimais(valor) <= CFG_MAPA['casas_decimais'] for valor in valores)
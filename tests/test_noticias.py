@@ -0,0 +1,76 @@
+import functools
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from services import noticias
+from services.noticias import scrape_cnn_news, scrape_dengue_info, scrape_g1_news
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+class PaginasSalvas(SimpleHTTPRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+
+# Servidor HTTP local com as páginas salvas (os parsers são testados pelo mesmo caminho da coleta real)
+@pytest.fixture(scope='module')
+def servidor():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(PaginasSalvas, directory=FIXTURES))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_cnn_filtra_dengue_e_resolve_links(servidor):
+    noticias = scrape_cnn_news(f'{servidor}/cnn_dengue.html')
+    assert [n['title'] for n in noticias] == ['Casos de dengue crescem no Rio', 'Vacina contra zika entra em testes']
+    assert noticias[0]['link'] == f'{servidor}/saude/casos-de-dengue-crescem-no-rio/'
+    assert noticias[1]['link'] == 'https://www.cnnbrasil.com.br/saude/vacina-contra-zika/'
+    assert noticias[0]['date'] == '10/03/2024 às 08:00'
+    assert noticias[0]['description'] == 'Secretaria confirma aumento de casos de dengue'
+
+
+def test_g1_filtra_dengue_e_resolve_links(servidor):
+    noticias = scrape_g1_news('RJ', url=f'{servidor}/g1_busca.html')
+    assert [n['title'] for n in noticias] == ['Rio registra alta de dengue', 'Mutirão contra o mosquito']
+    assert noticias[0]['link'] == 'http://g1.globo.com/rj/rio-de-janeiro/noticia/2024/03/10/dengue-rj.ghtml'
+    assert noticias[1]['link'] == f'{servidor}/busca/click?q=dengue+RJ&u=mosquito-rj'
+    assert noticias[0]['date'] == 'há 2 dias'
+
+
+def test_dengue_info(servidor):
+    paragrafos = scrape_dengue_info(f'{servidor}/dengue_info.html')
+    assert paragrafos[0].startswith('A dengue é uma doença viral')
+    assert len(paragrafos) == 2
+
+
+# Página sem o seletor no HTML estático: só então o Selenium é usado
+def test_selenium_so_para_pagina_que_depende_de_javascript(servidor, monkeypatch):
+    chamadas = []
+    with open(os.path.join(FIXTURES, 'cnn_dengue.html'), encoding='utf-8') as f:
+        renderizada = f.read()
+    monkeypatch.setattr(noticias, 'html_selenium', lambda url, seletor, timeout: chamadas.append(url) or renderizada)
+    noticias_cnn = scrape_cnn_news(f'{servidor}/dengue_info.html')
+    assert chamadas == [f'{servidor}/dengue_info.html']
+    assert len(noticias_cnn) == 2
+
+
+# Fonte fora do ar ou com erro HTTP: o erro sobe, sem abrir o navegador
+def test_erro_de_rede_nao_abre_o_navegador(servidor, monkeypatch):
+    def html_selenium(*args):
+        raise AssertionError('Selenium não deveria ser usado')
+    monkeypatch.setattr(noticias, 'html_selenium', html_selenium)
+    with pytest.raises(requests.HTTPError):
+        scrape_cnn_news(f'{servidor}/inexistente.html')
+    with pytest.raises(requests.ConnectionError):
+        scrape_cnn_news('http://127.0.0.1:9/', timeout=1)
+    resultados = noticias.coletar_em_paralelo({'cnn': (scrape_cnn_news, (f'{servidor}/inexistente.html',)),
+                                               'info': (scrape_dengue_info, (f'{servidor}/dengue_info.html',))})
+    assert isinstance(resultados['cnn'], requests.HTTPError)
+    assert len(resultados['info']) == 2
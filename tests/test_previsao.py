@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+from model.artefatos import treinar_artefato
+from model.previsao import Previsor
+
+# Campos do modelo Item da API (de onde a previsão lê as features)
+CAMPOS_ITEM = ['municipio', 'casos_est', 'casos_est_min', 'casos_est_max', 'casos', 'proba_disse',
+               'incidência_100khab', 'disseminação', 'população', 'tempmin', 'umidmax', 'umidmed', 'umidmin',
+               'tempmed', 'tempmax', 'estado', 'longitude', 'latitude', 'data_week']
+
+
+# Features como as dos arquivos do infodengue (depois de preparar_dados)
+def dados_infodengue(n=40):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({'SE': np.arange(n), 'casos_est': rng.random(n) * 100, 'casos_est_min': 1, 'casos_est_max': 200,
+                      'p_rt1': rng.random(n), 'p_inc100k': rng.random(n) * 50, 'Rt': rng.random(n), 'pop': 10000.0,
+                      'tempmin': 20.0, 'umidmax': 90.0, 'umidmed': 70.0, 'umidmin': 50.0, 'tempmed': 25.0, 'tempmax': 30.0})
+    return X, pd.Series(rng.integers(0, 100, n))
+
+
+def registro(**valores):
+    base = {campo: 1 for campo in CAMPOS_ITEM}
+    base.update(municipio='M1', estado='RJ', data_week='2024-01-07')
+    base.update(valores)
+    return base
+
+
+def test_previsao_le_features_dos_campos_do_item():
+    artefato = treinar_artefato(*dados_infodengue())
+    assert 'SE' not in artefato['features']
+    assert artefato['mapeamento']['p_rt1'] == 'proba_disse'
+    previsor = Previsor(artefato, colunas=CAMPOS_ITEM)
+    registros = {('M1', '2024-01-07'): registro(proba_disse=0.5, população=10000)}
+    previsoes = previsor.prever([('M1', '2024-01-07'), ('M2', '2024-01-07')], lambda *chave: registros.get(chave))
+    assert isinstance(previsoes[0], float)
+    assert previsoes[1] is None
+
+
+def test_artefato_sem_campo_correspondente_e_recusado_ao_carregar():
+    artefato = treinar_artefato(*dados_infodengue())
+    del artefato['mapeamento']
+    with pytest.raises(ValueError, match='p_rt1'):
+        Previsor(artefato, colunas=CAMPOS_ITEM)
@@ -0,0 +1,79 @@
+import threading
+import pandas as pd
+import pytest
+from services.registros import RegistroStore
+from services.registros_sqlite import RegistroSQLite
+
+COLUNAS = {'municipio': 'TEXT', 'casos': 'INTEGER', 'tempmed': 'REAL', 'umidmax': 'INTEGER', 'estado': 'TEXT', 'data_week': 'TEXT'}
+
+
+def registros_iniciais():
+    return pd.DataFrame({
+        'municipio': ['M1', 'M1', 'M1', 'M2'],
+        'casos': [10, 20, 30, 40],
+        'tempmed': [25.0, 26.0, 27.0, 28.0],
+        'umidmax': [80, 81, 82, 83],
+        'estado': ['RJ', 'RJ', 'RJ', 'SP'],
+        'data_week': ['2024-01-07', '2024-01-14', '2024-01-21', '2024-01-07'],
+    })
+
+
+# Os dois backends da API, criados com os mesmos registros iniciais
+@pytest.fixture(params=['memoria', 'sqlite'])
+def registros(request, tmp_path):
+    if request.param == 'memoria':
+        return RegistroStore(registros_iniciais())
+    return RegistroSQLite(str(tmp_path / 'registros.sqlite'), COLUNAS, semente=registros_iniciais())
+
+
+def test_put_mantem_todas_as_semanas_do_municipio(registros):
+    novo = {'municipio': 'M1', 'casos': 99, 'tempmed': 30.5, 'umidmax': 90, 'estado': 'RJ', 'data_week': '2024-02-04'}
+    resultado = registros.atualizar_municipio('M1', novo)
+    assert resultado == {**novo, 'data_week': '2024-01-07'}
+    assert sorted(registros.buscar('M1'), key=lambda r: r['data_week']) == [
+        {**novo, 'data_week': semana} for semana in ('2024-01-07', '2024-01-14', '2024-01-21')]
+    assert registros.buscar_chave('M1', '2024-01-14')['casos'] == 99
+    assert registros.buscar_chave('M1', '2024-02-04') is None
+    assert registros.buscar('M2')[0]['casos'] == 40
+    assert len(registros) == 4
+
+
+def test_put_de_municipio_inexistente(registros):
+    novo = {'municipio': 'M9', 'casos': 1, 'tempmed': 1.0, 'umidmax': 1, 'estado': 'RJ', 'data_week': '2024-01-07'}
+    assert registros.atualizar_municipio('M9', novo) is None
+    assert len(registros) == 4
+
+
+# O mesmo PUT nos dois backends deixa os mesmos registros
+def test_put_igual_nos_dois_backends(tmp_path):
+    memoria = RegistroStore(registros_iniciais())
+    sqlite = RegistroSQLite(str(tmp_path / 'registros.sqlite'), COLUNAS, semente=registros_iniciais())
+    novo = {'municipio': 'M1', 'casos': 5, 'tempmed': 21.0, 'umidmax': 70, 'estado': 'RJ', 'data_week': '2024-01-14'}
+    assert memoria.atualizar_municipio('M1', novo) == sqlite.atualizar_municipio('M1', novo)
+    ordenar = lambda df: df.sort_values(['municipio', 'data_week']).reset_index(drop=True)
+    pd.testing.assert_frame_equal(ordenar(memoria.para_dataframe()), ordenar(sqlite.para_dataframe()), check_dtype=False)
+
+
+# PUT concorrente com DELETE do mesmo município (outro worker): o PUT devolve o registro ou None, nunca falha
+def test_put_concorrente_com_delete(tmp_path):
+    caminho = str(tmp_path / 'registros.sqlite')
+    sqlite = RegistroSQLite(caminho, COLUNAS, semente=registros_iniciais())
+    outro_worker = RegistroSQLite(caminho, COLUNAS)
+    semente = registros_iniciais().to_dict('records')
+    parar = threading.Event()
+
+    def remover_e_reinserir():
+        while not parar.is_set():
+            outro_worker.remover_municipio('M1')
+            outro_worker.inserir_lote([r for r in semente if r['municipio'] == 'M1'])
+
+    thread = threading.Thread(target=remover_e_reinserir)
+    thread.start()
+    try:
+        novo = {'municipio': 'M1', 'casos': 7, 'tempmed': 22.0, 'umidmax': 60, 'estado': 'RJ', 'data_week': '2024-01-07'}
+        for _ in range(300):
+            resultado = sqlite.atualizar_municipio('M1', novo)
+            assert resultado is None or resultado['casos'] == 7
+    finally:
+        parar.set()
+        thread.join()